@@ -593,24 +593,48 @@ def get_or_create_fcurve(action: bpy.types.Action, slot_name: str, data_path: st
     """
     slot = get_or_create_action_slot(action, slot_name)
     channelbag = _get_or_create_channelbag(action, slot)
+    return _get_or_create_channelbag_fcurve(channelbag, data_path, index)
 
+
+def _get_or_create_channelbag_fcurve(
+    channelbag: bpy.types.ActionChannelbag, data_path: str, index: int
+) -> bpy.types.FCurve:
+    """Gets or creates an F-Curve in an already resolved channelbag."""
     fcurve = channelbag.fcurves.find(data_path, index=index)
     if not fcurve:
         fcurve = channelbag.fcurves.new(data_path, index=index)
     return fcurve
 
 
+def _keyframe_interpolation_value(interpolation: str) -> int:
+    """Returns the integer value of a Keyframe.interpolation item, as read and written by foreach_get/set."""
+    return bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items[interpolation].value
+
+
 def set_fcurve_keyframes(fcurve: bpy.types.FCurve, keyframes: list[tuple[float, float]]) -> None:
     """Populates an F-Curve with keyframes and sets their interpolation to LINEAR.
 
+    The keyframes may be in any order. If a frame is given more than once, the
+    last value given for it is kept, as with `keyframe_points.insert`.
+
     Args:
         fcurve: The F-Curve to modify.
         keyframes: A list of (frame, value) tuples.
     """
     fcurve.keyframe_points.clear()
-    for frame, value in keyframes:
-        kp = fcurve.keyframe_points.insert(frame, value)
-        kp.interpolation = "LINEAR"
+    co = np.asarray(keyframes, dtype=np.float32).reshape(-1, 2)
+    # First occurrence of each frame in the reversed array is its last one in the input
+    _, last_indices = np.unique(co[::-1, 0], return_index=True)
+    co = co[::-1][last_indices]
+    n = len(co)
+    if n:
+        # Allocate all points at once and write coordinates and interpolation in
+        # single buffer copies; fcurve.update() below recomputes the handles.
+        fcurve.keyframe_points.add(count=n)
+        fcurve.keyframe_points.foreach_set("co", co.ravel())
+        fcurve.keyframe_points.foreach_set(
+            "interpolation", np.full(n, _keyframe_interpolation_value("LINEAR"), dtype=np.int32)
+        )
     fcurve.update()
 
 
@@ -653,16 +677,9 @@ def get_children_of_object(obj_ref: "BlenderObjRef", recursive: bool = False) ->
     if not obj:
         raise ValueError(f"Blender object with ID {obj_ref._id} not found.")
 
-    children = []
-    if not recursive:
-        children.extend([BlenderObjRef(child.name) for child in obj.children])
-    else:
-        queue = list(obj.children)
-        while queue:
-            current_obj = queue.pop(0)
-            children.append(BlenderObjRef(current_obj.name))
-            queue.extend(current_obj.children)
-    return children
+    # Both properties scan bpy.data.objects once; walking .children level by level would rescan it per object
+    children = obj.children_recursive if recursive else obj.children
+    return [BlenderObjRef(child.name) for child in children]
 
 
 def get_object_by_name(name: str) -> Optional["BlenderObjRef"]:
@@ -891,9 +908,9 @@ def sample_fcurve(fcurve: bpy.types.FCurve, start_frame: int, end_frame: int) ->
     Returns:
         A NumPy array of the evaluated F-Curve values for each frame.
     """
+    # FCurve.convert_to_samples would bake the curve in place, so evaluate each frame but fill the array directly
     frames = np.arange(start_frame, end_frame + 1)
-    values = np.array([fcurve.evaluate(f) for f in frames])
-    return values
+    return np.fromiter(map(fcurve.evaluate, frames), dtype=np.float64, count=len(frames))
 
 
 def get_fcurve_on_object(obj_ref: BlenderObjRef, data_path: str, index: int = -1) -> bpy.types.FCurve | None:
@@ -1072,9 +1089,10 @@ def set_fcurves_from_numpy(
     """Populates multiple F-Curves in an Action from a single NumPy array.
 
     This function is optimized to write data in batches. It first creates all
-    necessary F-Curves, then pre-allocates the keyframe points for each curve,
-    and finally iterates through the NumPy data to set the coordinates for each
-    keyframe. This is significantly faster than inserting keyframes one by one.
+    necessary F-Curves, then for each column masks out the NaN values with NumPy,
+    pre-allocates the keyframe points and writes their coordinates and
+    interpolation with a single foreach_set each. This is significantly faster
+    than inserting keyframes one by one.
 
     Args:
         action: The Action to add the F-Curves to.
@@ -1091,38 +1109,39 @@ def set_fcurves_from_numpy(
 
     num_frames = data.shape[0]
 
-    # 1. Get or create all F-Curves first and clear existing data.
+    # 1. Get or create all F-Curves first and clear existing data. The slot and channelbag
+    #    are resolved once per slot name rather than once per column.
+    channelbags = {}
     fcurves = []
     for slot_name, data_path, index in columns:
-        fcurve = get_or_create_fcurve(action, slot_name, data_path, index if index is not None else -1)
+        channelbag = channelbags.get(slot_name)
+        if channelbag is None:
+            slot = get_or_create_action_slot(action, slot_name)
+            channelbag = channelbags[slot_name] = _get_or_create_channelbag(action, slot)
+        fcurve = _get_or_create_channelbag_fcurve(channelbag, data_path, index if index is not None else -1)
         fcurve.keyframe_points.clear()
         fcurves.append(fcurve)
 
-    # 2. Pre-calculate the number of valid keyframes for each F-Curve.
-    valid_keyframe_counts = [np.count_nonzero(~np.isnan(data[:, i])) for i in range(data.shape[1])]
-
-    # 3. Add the required number of keyframe points to each F-Curve in a batch.
-    for i, fcurve in enumerate(fcurves):
-        if valid_keyframe_counts[i] > 0:
-            fcurve.keyframe_points.add(count=valid_keyframe_counts[i])
-
-    # 4. Iterate through the data and set the keyframes.
-    keyframe_indices = [0] * len(fcurves)
-    for frame_offset in range(num_frames):
-        current_frame = start_frame + frame_offset
-        for col_idx, fcurve in enumerate(fcurves):
-            value = data[frame_offset, col_idx]
-            if not np.isnan(value):
-                kp_idx = keyframe_indices[col_idx]
-                kp = fcurve.keyframe_points[kp_idx]
-                kp.co = (float(current_frame), value)
-                kp.interpolation = interpolation
-                keyframe_indices[col_idx] += 1
-
-    # 5. Update all F-Curves.
-    for fcurve in fcurves:
+    # 2. Shared buffers: the frame of each row, and interleaved (frame, value) pairs and
+    #    interpolation values that every column fills a prefix of.
+    frames = np.arange(start_frame, start_frame + num_frames, dtype=np.float32)
+    co = np.empty(2 * num_frames, dtype=np.float32)
+    interpolations = np.full(num_frames, _keyframe_interpolation_value(interpolation), dtype=np.int32)
+
+    # 3. Write each column's non-NaN values in bulk and update the F-Curve.
+    for col_idx, fcurve in enumerate(fcurves):
+        column = data[:, col_idx]
+        valid = ~np.isnan(column)
+        n_valid = int(np.count_nonzero(valid))
+        if n_valid > 0:
+            co[0 : 2 * n_valid : 2] = frames[valid]
+            co[1 : 2 * n_valid : 2] = column[valid]
+            fcurve.keyframe_points.add(count=n_valid)
+            fcurve.keyframe_points.foreach_set("co", co[: 2 * n_valid])
+            fcurve.keyframe_points.foreach_set("interpolation", interpolations[:n_valid])
         fcurve.update()
 
+
 def shift_action(action: bpy.types.Action, frame_delta: int) -> None:
     """Shifts all keyframes in an Action by a given frame delta.
 
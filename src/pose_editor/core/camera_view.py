@@ -336,15 +336,19 @@ def create_camera_view(name: str, video_file: Path, pose_data_dir: Path, skeleto
 
     num_frames = int(max_frame - min_frame + 1)
     num_joints = len(skeleton_obj._skeleton.leaves)
+    # Walk the skeleton once; the per-frame loops below only need the joints that carry data
+    joint_nodes = [
+        joint_node
+        for joint_node in PreOrderIter(skeleton_obj._skeleton)
+        if hasattr(joint_node, "id") and joint_node.id is not None
+    ]
 
     for person_idx, frames_data in pose_data_by_person.items():
         series_name = f"{name}_person{person_idx}"
         marker_data = MarkerData.create_new(series_name, "COCO_133", camera_view=camera_view)
 
         columns_to_extract = []
-        for joint_node in PreOrderIter(skeleton_obj._skeleton):
-            if not hasattr(joint_node, "id") or joint_node.id is None:
-                continue
+        for joint_node in joint_nodes:
             joint_name = joint_node.name
             columns_to_extract.append((joint_name, "location", 0))  # X
             columns_to_extract.append((joint_name, "location", 1))  # Y
@@ -356,9 +360,7 @@ def create_camera_view(name: str, video_file: Path, pose_data_dir: Path, skeleto
             if frame_num in frames_data:
                 keypoints = frames_data[frame_num]
                 col_idx = 0
-                for joint_node in PreOrderIter(skeleton_obj._skeleton):
-                    if not hasattr(joint_node, "id") or joint_node.id is None:
-                        continue
+                for joint_node in joint_nodes:
                     kp_idx = joint_node.id * 3
                     if kp_idx + 2 < len(keypoints):
                         x, y, likelihood = keypoints[kp_idx], keypoints[kp_idx + 1], keypoints[kp_idx + 2]
@@ -372,9 +374,7 @@ def create_camera_view(name: str, video_file: Path, pose_data_dir: Path, skeleto
             else:
                 # Person not detected in this frame, set quality to -1
                 col_idx = 0
-                for joint_node in PreOrderIter(skeleton_obj._skeleton):
-                    if not hasattr(joint_node, "id") or joint_node.id is None:
-                        continue
+                for joint_node in joint_nodes:
                     # The quality is the 3rd value for each joint (x, y, quality)
                     np_data[frame_idx, col_idx + 2] = -1.0
                     col_idx += 3
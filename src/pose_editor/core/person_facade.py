@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 
+from bisect import bisect_right
 from typing import TYPE_CHECKING, Optional
 
 import numpy as np
@@ -13,7 +14,7 @@ from ..blender.dal import CAMERA_VIEW_ID, BlenderObjRef
 from .calibration import Calibration
 from .marker_data import MarkerData
 from .skeleton import SkeletonBase, get_skeleton
-from .triangulation import TriangulationOutput, triangulate_point
+from .triangulation import TriangulationOutput, projection_matrices, triangulate_point, triangulate_points_batch
 
 if TYPE_CHECKING:
     from .person_data_view import PersonDataView
@@ -27,6 +28,9 @@ ACTIVE_TRACK_INDEX = dal.CustomProperty[int]("active_track_index")
 PERSON_NAME = dal.CustomProperty[str]("person_name")
 POSE_EDITOR_OBJECT_TYPE = dal.CustomProperty[str]("pose_editor_object_type")
 
+# Largest mean reprojection error, in pixels, accepted for a triangulated marker
+_REPROJ_ERROR_THRESHOLD = 10.0
+
 _all_person_instances_cache: dict[str, "RealPersonInstanceFacade"] = {}
 class RealPersonInstanceFacade:
     """A facade for a Real Person Instance.
@@ -192,10 +196,11 @@ class RealPersonInstanceFacade:
         if not fcurve:
             return scene_end
 
+        # Keyframes come back sorted by frame, so the first one after start_frame can be bisected
         keyframes = dal.get_fcurve_keyframes(fcurve)
-        for frame, _ in keyframes:
-            if frame > start_frame:
-                return int(frame) - 1  # The segment ends the frame before the next stitch
+        next_idx = bisect_right(keyframes, start_frame, key=lambda keyframe: keyframe[0])
+        if next_idx < len(keyframes):
+            return int(keyframes[next_idx][0]) - 1  # The segment ends the frame before the next stitch
 
         return scene_end
 
@@ -263,7 +268,7 @@ class RealPersonInstanceFacade:
             print(f"Error: Could not find or create MarkerData for {marker_data_3d_name}")
             return
 
-        # 4. Loop through frames and markers, collecting triangulation results
+        # 4. Prepare the outputs, one row per frame
         num_frames = frame_end - frame_start + 1
         marker_nodes = [
             node for node in PreOrderIter(skeleton._skeleton) if hasattr(node, "id") and node.id is not None
@@ -277,57 +282,90 @@ class RealPersonInstanceFacade:
         output_cam_bools = np.zeros((num_frames, num_markers * len(all_camera_names)), dtype=bool)
 
         calib_by_cam = calibration._data
+        proj_matrices_by_cam = projection_matrices(calib_by_cam)
+        cam_columns = {cam_name: cam_idx for cam_idx, cam_name in enumerate(all_camera_names)}
+
+        # 5. Find the 2D data of every view whose camera is calibrated
+        actions_by_camera = {}
+        for pdv in person_pdvs:
+            cam_view = pdv.get_camera_view()
+            if not cam_view or not cam_view._obj:
+                continue
+
+            calib_cam_name = dal.get_custom_property(cam_view._obj, dal.CALIBRATION_CAMERA_NAME)
+            if not calib_cam_name or calib_cam_name not in proj_matrices_by_cam:
+                continue
+
+            marker_data_2d = pdv.get_data_series()
+            if not marker_data_2d or not marker_data_2d.action:
+                continue
+
+            actions_by_camera[calib_cam_name] = marker_data_2d.action
+
+        view_camera_names = list(actions_by_camera)
+
+        for marker_idx, marker_node in enumerate(marker_nodes):
+            marker_name = marker_node.name
+
+            # 6. Sample this marker's x, y and quality in every view over the whole frame range
+            points_2d = np.full((num_frames, len(view_camera_names), 3), np.nan)
+            has_data = np.zeros(len(view_camera_names), dtype=bool)
+            for view_idx, action in enumerate(actions_by_camera.values()):
+                fcurves = (
+                    dal.get_fcurve_from_action(action, marker_name, "location", 0),
+                    dal.get_fcurve_from_action(action, marker_name, "location", 1),
+                    dal.get_fcurve_from_action(action, marker_name, '["quality"]', -1),
+                )
+                if all(fcurves):
+                    has_data[view_idx] = True
+                    for channel, fcurve in enumerate(fcurves):
+                        points_2d[:, view_idx, channel] = dal.sample_fcurve(fcurve, frame_start, frame_end)
+
+            if has_data.sum() < 2:
+                continue
+
+            # 7. Triangulate all frames at once from every usable camera. This is the first camera
+            #    set triangulate_point tries, so only frames over the error threshold need its
+            #    search for a better subset.
+            points_3d, reprojection_errors, cameras_used = triangulate_points_batch(
+                points_2d,
+                calib_by_cam,
+                view_camera_names,
+                projection_matrices_by_camera=proj_matrices_by_cam,
+            )
 
-        for frame_offset, frame in enumerate(range(frame_start, frame_end + 1)):
-            for marker_idx, marker_node in enumerate(marker_nodes):
-                marker_name = marker_node.name
-
-                # 5. Gather 2D data for this marker at this frame from all views
-                points_2d_by_camera = {}
-                for pdv in person_pdvs:
-                    cam_view = pdv.get_camera_view()
-                    if not cam_view or not cam_view._obj:
-                        continue
-
-                    calib_cam_name = dal.get_custom_property(cam_view._obj, dal.CALIBRATION_CAMERA_NAME)
-                    if not calib_cam_name:
-                        continue
-
-                    marker_data_2d = pdv.get_data_series()
-                    if not marker_data_2d or not marker_data_2d.action:
-                        continue
-
-                    fcurve_x = dal.get_fcurve_from_action(marker_data_2d.action, marker_name, "location", 0)
-                    fcurve_y = dal.get_fcurve_from_action(marker_data_2d.action, marker_name, "location", 1)
-                    fcurve_quality = dal.get_fcurve_from_action(marker_data_2d.action, marker_name, '["quality"]', -1)
-
-                    if fcurve_x and fcurve_y and fcurve_quality:
-                        x = fcurve_x.evaluate(frame)
-                        y = fcurve_y.evaluate(frame)
-                        quality = fcurve_quality.evaluate(frame)
-                        points_2d_by_camera[calib_cam_name] = np.array([x, y, quality])
-
-                # 6. Triangulate the point
-                if len(points_2d_by_camera) >= 2:
-                    result: TriangulationOutput | None = triangulate_point(
-                        points_2d_by_camera=points_2d_by_camera,
-                        calibration_by_camera=calib_by_cam,
-                    )
-                    # 7. Collect results
-                    if result:
-                        loc_col_start = marker_idx * 3
-                        output_locations[frame_offset, loc_col_start : loc_col_start + 3] = result.point_3d
-                        output_reprojection_errors[frame_offset, marker_idx] = result.reprojection_error
-                        output_cam_counts[frame_offset, marker_idx] = len(result.contributing_cameras)
-
-                        # Set boolean flags for each camera
-                        for cam_idx, cam_name in enumerate(all_camera_names):
-                            bool_col_start = marker_idx * len(all_camera_names)
-                            output_cam_bools[
-                                frame_offset, bool_col_start + cam_idx
-                            ] = (cam_name in result.contributing_cameras)
-
-        # 8. Define the columns for the NumPy array and write to F-Curves
+            # 8. Collect the frames solved within the threshold
+            accepted = reprojection_errors < _REPROJ_ERROR_THRESHOLD
+            loc_col_start = marker_idx * 3
+            bool_col_start = marker_idx * len(all_camera_names)
+            bool_cols = [bool_col_start + cam_columns[cam_name] for cam_name in view_camera_names]
+
+            output_locations[accepted, loc_col_start : loc_col_start + 3] = points_3d[accepted]
+            output_reprojection_errors[accepted, marker_idx] = reprojection_errors[accepted]
+            output_cam_counts[accepted, marker_idx] = cameras_used[accepted].sum(axis=-1)
+            output_cam_bools[np.ix_(accepted, bool_cols)] = cameras_used[accepted]
+
+            # Frames without an error had too few usable cameras, so no camera subset can do better
+            retry = ~accepted & ~np.isnan(reprojection_errors)
+            for frame_offset in np.flatnonzero(retry):
+                result: TriangulationOutput | None = triangulate_point(
+                    points_2d_by_camera={
+                        cam_name: points_2d[frame_offset, view_idx]
+                        for view_idx, cam_name in enumerate(view_camera_names)
+                        if has_data[view_idx]
+                    },
+                    calibration_by_camera=calib_by_cam,
+                    reproj_error_threshold=_REPROJ_ERROR_THRESHOLD,
+                    projection_matrices_by_camera=proj_matrices_by_cam,
+                )
+                if result:
+                    output_locations[frame_offset, loc_col_start : loc_col_start + 3] = result.point_3d
+                    output_reprojection_errors[frame_offset, marker_idx] = result.reprojection_error
+                    output_cam_counts[frame_offset, marker_idx] = len(result.contributing_cameras)
+                    for cam_name in result.contributing_cameras:
+                        output_cam_bools[frame_offset, bool_col_start + cam_columns[cam_name]] = True
+
+        # 9. Define the columns for the NumPy array and write to F-Curves
         final_columns = []
         for marker_idx, marker_node in enumerate(marker_nodes):
             marker_name = marker_node.name
@@ -368,7 +406,7 @@ class RealPersonInstanceFacade:
             data=final_data_array,
         )
 
-        # 9. Connect the 3D view to the newly populated MarkerData
+        # 10. Connect the 3D view to the newly populated MarkerData
         person_3d_view.connect_to_series(marker_data_3d)
 
         print("Triangulation data successfully written to f-curves.")
\ No newline at end of file
@@ -1,7 +1,14 @@
 
-from anytree import Node, findall
+from typing import Iterable, TypeVar
+
+import numpy as np
+from anytree import Node, PreOrderIter
 from ..pose2sim.skeletons import COCO_133, get_skeleton_definition
 from dataclasses import dataclass
+
+K = TypeVar("K")
+V = TypeVar("V")
+
 @dataclass 
 class BodyPartDef:
     name: str
@@ -16,7 +23,7 @@ class SkeletonBase:
     structure of a skeleton with joints identified by names and IDs.
     """
 
-    _body_part_map : dict[str, str] = {}
+    __slots__ = ("_skeleton", "_name", "_id_to_name", "_name_to_id", "_body_parts", "_body_part_map")
 
     def __init__(self, skeleton_def: Node, name: str = "UnnamedSkeleton", body_parts: list[BodyPartDef] = []):
         """
@@ -27,8 +34,15 @@ class SkeletonBase:
         """
         self._skeleton = skeleton_def
         self._name = name
+        # Flatten the joint hierarchy once so that joint lookups are plain dict hits
+        self._id_to_name: dict[int, str | None] = self._build_unique_map(
+            (node.id, node.name) for node in PreOrderIter(self._skeleton) if getattr(node, "id", None) is not None
+        )
+        self._name_to_id: dict[str, int | None] = self._build_unique_map(
+            (node.name, getattr(node, "id", None)) for node in PreOrderIter(self._skeleton)
+        )
         self._body_parts = body_parts
-        self._update_body_part_map_children(self._skeleton, "Unknown", body_parts)
+        self._body_part_map: dict[str, str] = self._build_body_part_map(body_parts)
 
     @property
     def name(self) -> str:
@@ -47,11 +61,7 @@ class SkeletonBase:
         """
         if joint_id is None:
             return None
-
-        nodes = findall(self._skeleton, lambda node: node.id == joint_id)
-        if len(nodes) == 1:
-            return nodes[0].name
-        return None
+        return self._id_to_name.get(joint_id)
 
     def get_joint_id(self, joint_name: str) -> int | None:
         """
@@ -65,11 +75,7 @@ class SkeletonBase:
         """
         if joint_name is None:
             return None
-
-        nodes = findall(self._skeleton, lambda node: node.name == joint_name)
-        if len(nodes) == 1:
-            return nodes[0].id
-        return None
+        return self._name_to_id.get(joint_name)
 
     def body_part(self, joint_name: str) -> str:
         """
@@ -109,20 +115,55 @@ class SkeletonBase:
         pass
 
 
-    def _update_body_part_map_children(self, parent_node: Node, body_part_name: str, body_parts: list[BodyPartDef] = []):
+    @staticmethod
+    def _build_unique_map(pairs: Iterable[tuple[K, V]]) -> dict[K, V | None]:
+        """
+        Builds a lookup dictionary from (key, value) pairs, mapping keys that occur more than once to None.
+
+        A joint id or name shared by several nodes does not identify a single joint,
+        so looking it up gives None rather than whichever node comes last.
+
+        Args:
+            pairs: An iterable of (key, value) tuples.
+
+        Returns:
+            A dictionary mapping each key to its value, or to None if the key is not unique.
         """
-        Updates the internal mapping of joint names to body parts based on the defined body parts.
+        mapping: dict[K, V | None] = {}
+        for key, value in pairs:
+            mapping[key] = None if key in mapping else value
+        return mapping
+
+    def _build_body_part_map(self, body_parts: list[BodyPartDef]) -> dict[str, str]:
         """
-        node_def = next((bp for bp in body_parts if bp.parent_node_name == parent_node.name), None)
-        current_node_part = body_part_name
-        if node_def:
-            if node_def.include_parent:
-                current_node_part = node_def.name
-            body_part_name = node_def.name
-        self._body_part_map[parent_node.name] = current_node_part
+        Flattens the body part definitions into a joint name to body part mapping.
 
-        for child in parent_node.children:
-            self._update_body_part_map_children(child, body_part_name, body_parts)
+        A body part covers the subtree below its parent node, and the parent node
+        itself if `include_parent` is set. Joints outside any body part map to "Unknown".
+
+        Args:
+            body_parts: The body part definitions of the skeleton.
+
+        Returns:
+            A dictionary mapping joint names to body part names.
+        """
+        defs_by_parent: dict[str, BodyPartDef] = {}
+        for bp in body_parts:
+            defs_by_parent.setdefault(bp.parent_node_name, bp)
+
+        body_part_map: dict[str, str] = {}
+        stack: list[tuple[Node, str]] = [(self._skeleton, "Unknown")]
+        while stack:
+            node, body_part_name = stack.pop()
+            node_def = defs_by_parent.get(node.name)
+            current_node_part = body_part_name
+            if node_def:
+                if node_def.include_parent:
+                    current_node_part = node_def.name
+                body_part_name = node_def.name
+            body_part_map[node.name] = current_node_part
+            stack.extend((child, body_part_name) for child in node.children)
+        return body_part_map
 
 
 _coco_133_body_parts =  [
@@ -143,6 +184,13 @@ class COCO133Skeleton(SkeletonBase):
     A specialized skeleton class for COCO_133 that calculates fake markers for Hip and Neck.
     """
 
+    __slots__ = ()
+
+    # Fake marker name -> pair of joints whose midpoint defines its position
+    _FAKE_MARKERS: dict[str, tuple[str, str]] = {
+        "Hip": ("RHip", "LHip"),
+        "Neck": ("RShoulder", "LShoulder"),
+    }
 
     def __init__(self):
         super().__init__(COCO_133, "COCO_133", _coco_133_body_parts)
@@ -159,27 +207,29 @@ class COCO133Skeleton(SkeletonBase):
         Returns:
             A list of floats representing the calculated position, or None if input data is insufficient.
         """
-        if name == "Hip":
-            rhip_data = marker_data.get("RHip")
-            lhip_data = marker_data.get("LHip")
-            if rhip_data and lhip_data and len(rhip_data) == len(lhip_data):
-                # Calculate midpoint for 2D or 3D coordinates
-                midpoint = [(rhip_data[i] + lhip_data[i]) / 2 for i in range(len(rhip_data))]
-                return midpoint
-        elif name == "Neck":
-            rshoulder_data = marker_data.get("RShoulder")
-            lshoulder_data = marker_data.get("LShoulder")
-            if rshoulder_data and lshoulder_data and len(rshoulder_data) == len(lshoulder_data):
-                # Calculate midpoint for 2D or 3D coordinates
-                midpoint = [(rshoulder_data[i] + lshoulder_data[i]) / 2 for i in range(len(rshoulder_data))]
-                return midpoint
-
-        return super().calculate_fake_marker_pos(name, marker_data)
+        pair = self._FAKE_MARKERS.get(name)
+        if pair is None:
+            return super().calculate_fake_marker_pos(name, marker_data)
+
+        first, second = (marker_data.get(joint_name) for joint_name in pair)
+        if first is None or second is None or len(first) == 0 or len(first) != len(second):
+            return None
+        if isinstance(first, np.ndarray) or isinstance(second, np.ndarray):
+            return ((np.asarray(first) + np.asarray(second)) * 0.5).tolist()
+        # Calculate midpoint for 2D or 3D coordinates
+        return [(a + b) / 2 for a, b in zip(first, second)]
+
+
+_skeleton_cache: dict[str, SkeletonBase] = {}
+
 
 def get_skeleton(skeleton_name: str) -> SkeletonBase:
     """
     Factory function to return a SkeletonBase (or subclass) for the given skeleton name.
 
+    Skeletons are built once per process and shared between callers, so the
+    returned instance must be treated as read-only.
+
     Args:
         skeleton_name (str): The name of the skeleton definition (e.g. "COCO_133", "HALPE_26").
 
@@ -189,10 +239,17 @@ def get_skeleton(skeleton_name: str) -> SkeletonBase:
     Raises:
         ValueError: If no skeleton definition with the given name exists.
     """
+    skeleton = _skeleton_cache.get(skeleton_name)
+    if skeleton is not None:
+        return skeleton
+
     if skeleton_name == "COCO_133":
-        return COCO133Skeleton()
-    try:
-        skeleton_def = get_skeleton_definition(skeleton_name)
-        return SkeletonBase(skeleton_def, skeleton_name)
-    except ValueError:
-        raise ValueError(f"No skeleton definition found for '{skeleton_name}'")
\ No newline at end of file
+        skeleton = COCO133Skeleton()
+    else:
+        try:
+            skeleton_def = get_skeleton_definition(skeleton_name)
+        except ValueError:
+            raise ValueError(f"No skeleton definition found for '{skeleton_name}'")
+        skeleton = SkeletonBase(skeleton_def, skeleton_name)
+    _skeleton_cache[skeleton_name] = skeleton
+    return skeleton
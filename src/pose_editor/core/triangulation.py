@@ -5,7 +5,7 @@
 """Module for 3D triangulation logic."""
 
 import itertools as it
-from typing import Dict, List, NamedTuple, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
@@ -13,7 +13,7 @@ import numpy as np
 class TriangulationOutput(NamedTuple):
     """The result of triangulating a single point in a single frame."""
     point_3d: np.ndarray  # Shape (3,) for (x, y, z)
-    contributing_cameras: List[str]  # Names of cameras used
+    contributing_cameras: Tuple[str, ...]  # Names of cameras used, sorted
     reprojection_error: float
 
 
@@ -39,37 +39,89 @@ def rodrigues(rotation_vector) -> np.ndarray:
 def weighted_triangulation(P_all, x_all, y_all, likelihood_all):
     """
     Triangulation with direct linear transform, weighted by likelihood.
+
+    All arguments may carry extra leading batch dimensions, in which case one
+    point is triangulated per batch entry with a single stacked SVD.
+
+    Args:
+        P_all: Stacked projection matrices, shape (..., N, 3, 4).
+        x_all: Observed x coordinates, shape (..., N).
+        y_all: Observed y coordinates, shape (..., N).
+        likelihood_all: Per-camera weights, shape (..., N).
+
+    Returns:
+        The homogeneous 3D point(s), shape (..., 4). Contains NaNs if fewer than two cameras are given.
     """
-    A_list = []
-    for c in range(len(x_all)):
-        P_cam = P_all[c]
-        A_list.append((P_cam[0] - x_all[c] * P_cam[2]) * likelihood_all[c])
-        A_list.append((P_cam[1] - y_all[c] * P_cam[2]) * likelihood_all[c])
-    A = np.array(A_list)
-
-    if np.shape(A)[0] >= 4:
-        # Use numpy's SVD
-        U, s, Vt = np.linalg.svd(A)
-        # The solution is the null space of A, corresponding to the singular vector
-        # associated with the smallest singular value. Vt is V transpose, and s is
-        # sorted high-to-low, so the last row of Vt is the vector we want.
-        Q = Vt[-1]
-        Q = Q / Q[3]  # Normalize homogeneous coordinate
-    else:
-        Q = np.array([np.nan, np.nan, np.nan, 1])
-    return Q
+    P_all = np.asarray(P_all, dtype=float)
+    n_cams = P_all.shape[-3]
+    if n_cams < 2:
+        return np.broadcast_to(np.array([np.nan, np.nan, np.nan, 1]), P_all.shape[:-3] + (4,)).copy()
+
+    weights = np.asarray(likelihood_all, dtype=float)[..., None]
+    # Two DLT rows per camera, built for all cameras at once
+    A = np.empty(P_all.shape[:-3] + (2 * n_cams, 4))
+    A[..., 0::2, :] = (P_all[..., 0, :] - np.asarray(x_all, dtype=float)[..., None] * P_all[..., 2, :]) * weights
+    A[..., 1::2, :] = (P_all[..., 1, :] - np.asarray(y_all, dtype=float)[..., None] * P_all[..., 2, :]) * weights
+
+    # The solution is the null space of A, corresponding to the singular vector
+    # associated with the smallest singular value. Vt is V transpose, and s is
+    # sorted high-to-low, so the last row of Vt is the vector we want.
+    _, _, Vt = np.linalg.svd(A, full_matrices=False)
+    Q = Vt[..., -1, :]
+    return Q / Q[..., 3:4]  # Normalize homogeneous coordinate
+
 
 def reprojection(P_all, Q):
-    x_calc, y_calc = [], []
-    for c in range(len(P_all)):
-        P_cam = P_all[c]
-        x_calc.append(P_cam[0] @ Q / (P_cam[2] @ Q))
-        y_calc.append(P_cam[1] @ Q / (P_cam[2] @ Q))
-    return x_calc, y_calc
+    """
+    Projects homogeneous 3D point(s) into every camera.
+
+    Args:
+        P_all: Stacked projection matrices, shape (..., N, 3, 4).
+        Q: The homogeneous 3D point(s), shape (..., 4).
+
+    Returns:
+        A tuple of arrays (x_calc, y_calc), each of shape (..., N).
+    """
+    projected = (np.asarray(P_all, dtype=float) @ np.asarray(Q)[..., None, :, None])[..., 0]
+    return projected[..., 0] / projected[..., 2], projected[..., 1] / projected[..., 2]
+
 
 def euclidean_distance(q1, q2):
-    dist = np.array(q1) - np.array(q2)
-    return np.sqrt(np.nansum(dist**2))
+    """Returns the Euclidean distance along the last axis of two point arrays, ignoring NaN components."""
+    dist = np.asarray(q1) - np.asarray(q2)
+    return np.sqrt(np.nansum(dist**2, axis=-1))
+
+
+def projection_matrix(calib: dict) -> np.ndarray:
+    """
+    Builds the 3x4 projection matrix P = K [R|t] of a camera.
+
+    Args:
+        calib: Calibration of a single camera with "matrix", "rotation" and "translation" entries.
+
+    Returns:
+        The projection matrix, shape (3, 4).
+    """
+    K = np.array(calib["matrix"], dtype=float)
+    R = rodrigues(np.array(calib["rotation"], dtype=float))
+    t = np.array(calib["translation"], dtype=float).reshape(3, 1)
+    return K @ np.hstack((R, t))
+
+
+def projection_matrices(calibration_by_camera: Dict[str, dict]) -> Dict[str, np.ndarray]:
+    """
+    Builds the projection matrix of every calibrated camera.
+
+    Compute these once and pass them to `triangulate_point` when triangulating
+    many points with the same calibration.
+
+    Args:
+        calibration_by_camera: Calibration data by camera name.
+
+    Returns:
+        The (3, 4) projection matrix of each camera with calibration data, by camera name.
+    """
+    return {name: projection_matrix(calib) for name, calib in calibration_by_camera.items() if calib}
 
 
 def triangulate_point(
@@ -78,43 +130,44 @@ def triangulate_point(
     min_cameras: int = 2,
     reproj_error_threshold: float = 10.0,
     min_quality: float = 0.5,
+    projection_matrices_by_camera: Optional[Dict[str, np.ndarray]] = None,
 ) -> Optional[TriangulationOutput]:
-    """Triangulates a single 3D point from multiple 2D observations."""
-    
-    camera_names = list(calibration_by_camera.keys())
-    x_all, y_all, likelihood_all, projection_matrices = [], [], [], []
-    
-    for name in camera_names:
+    """Triangulates a single 3D point from multiple 2D observations.
+
+    Args:
+        points_2d_by_camera: Observations holding x, y and quality, by camera name.
+        calibration_by_camera: Calibration data by camera name.
+        min_cameras: Minimum number of cameras to triangulate from.
+        reproj_error_threshold: Largest accepted mean reprojection error.
+        min_quality: Minimum quality for an observation to be used.
+        projection_matrices_by_camera: Projection matrices from `projection_matrices`
+            for `calibration_by_camera`. Built for the usable cameras if not given.
+
+    Returns:
+        The triangulated point, or None if it cannot be triangulated within the error threshold.
+    """
+
+    # Drop unusable observations first so that nothing is built for cameras that won't contribute
+    valid_camera_names = []
+    observations = []
+    for name, calib in calibration_by_camera.items():
         point_2d = points_2d_by_camera.get(name)
-        calib = calibration_by_camera.get(name)
-        
         if calib and point_2d is not None and point_2d[2] >= min_quality:
-            x_all.append(point_2d[0])
-            y_all.append(point_2d[1])
-            likelihood_all.append(point_2d[2])
-            
-            K = np.array(calib["matrix"])
-            R = rodrigues(np.array(calib["rotation"]))
-            t = np.array(calib["translation"]).reshape(3, 1)
-            Rt = np.hstack((R, t))
-            P = K @ Rt
-            projection_matrices.append(P)
-        else:
-            x_all.append(np.nan)
-            y_all.append(np.nan)
-            likelihood_all.append(0)
-            projection_matrices.append(None)
-
-    valid_indices = [i for i, p in enumerate(projection_matrices) if p is not None]
-    if len(valid_indices) < min_cameras:
-        return None
+            valid_camera_names.append(name)
+            observations.append(point_2d[:3])
 
-    x = np.array([x_all[i] for i in valid_indices])
-    y = np.array([y_all[i] for i in valid_indices])
-    quality = np.array([likelihood_all[i] for i in valid_indices])
-    proj_matrices = [projection_matrices[i] for i in valid_indices]
-    valid_camera_names = [camera_names[i] for i in valid_indices]
+    # A DLT solution needs at least two cameras, whatever min_cameras asks for
+    min_cameras = max(min_cameras, 2)
     n_cams = len(valid_camera_names)
+    if n_cams < min_cameras:
+        return None
+
+    # (N, 3) array of x, y, quality and (N, 3, 4) stack of projection matrices
+    points = np.array(observations, dtype=float)
+    if projection_matrices_by_camera is None:
+        Ps = np.stack([projection_matrix(calibration_by_camera[name]) for name in valid_camera_names])
+    else:
+        Ps = np.stack([projection_matrices_by_camera[name] for name in valid_camera_names])
 
     error_min = np.inf
     Q_best = None
@@ -122,46 +175,28 @@ def triangulate_point(
 
     nb_cams_off = 0
     while n_cams - nb_cams_off >= min_cameras:
-        error_configs = []
-        q_configs = []
-        indices_configs = []
-
-        for cam_indices in it.combinations(range(n_cams), n_cams - nb_cams_off):
-            if not cam_indices:
-                continue
-
-            current_indices = list(cam_indices)
-            P_current = [proj_matrices[i] for i in current_indices]
-            x_current = x[current_indices]
-            y_current = y[current_indices]
-            q_current = quality[current_indices]
-
-            Q = weighted_triangulation(P_current, x_current, y_current, q_current)
-            if np.isnan(Q).any():
-                continue
-
-            x_calc, y_calc = reprojection(P_current, Q)
-            
-            q_file = list(zip(x_current, y_current))
-            q_calc = list(zip(x_calc, y_calc))
-            
-            errors = [euclidean_distance(q_f, q_c) for q_f, q_c in zip(q_file, q_calc)]
-            mean_error = np.mean(errors)
-
-            error_configs.append(mean_error)
-            q_configs.append(Q)
-            indices_configs.append(current_indices)
-
-        if not error_configs:
+        # Evaluate every camera subset of this size in one batch: (K, M) index array
+        combos = np.array(list(it.combinations(range(n_cams), n_cams - nb_cams_off)), dtype=np.intp)
+        P_current = Ps[combos]
+        current_points = points[combos]
+
+        Q = weighted_triangulation(P_current, current_points[..., 0], current_points[..., 1], current_points[..., 2])
+        valid = ~np.isnan(Q).any(axis=-1)
+        if not valid.any():
             nb_cams_off += 1
             continue
 
-        min_err_for_this_iter = min(error_configs) if error_configs else np.inf
+        x_calc, y_calc = reprojection(P_current, Q)
+        errors = euclidean_distance(current_points[..., :2], np.stack((x_calc, y_calc), axis=-1))
+        mean_errors = errors.mean(axis=-1)
+
+        valid_configs = np.flatnonzero(valid)
+        best_config_idx = valid_configs[np.argmin(mean_errors[valid_configs])]
+        min_err_for_this_iter = float(mean_errors[best_config_idx])
         if min_err_for_this_iter < error_min:
             error_min = min_err_for_this_iter
-            best_config_idx = np.argmin(error_configs)
-            Q_best = q_configs[best_config_idx]
-            best_cam_indices = indices_configs[best_config_idx]
+            Q_best = Q[best_config_idx]
+            best_cam_indices = combos[best_config_idx]
 
         if error_min < reproj_error_threshold:
             break
@@ -171,10 +206,73 @@ def triangulate_point(
     if Q_best is None or error_min > reproj_error_threshold:
         return None
 
-    contributing_cams = [valid_camera_names[i] for i in best_cam_indices]
+    # Sorted so that results from the same camera set compare and hash equal
+    contributing_cams = tuple(sorted(valid_camera_names[i] for i in best_cam_indices))
 
     return TriangulationOutput(
         point_3d=Q_best[:3],
         contributing_cameras=contributing_cams,
         reprojection_error=error_min,
-    )
\ No newline at end of file
+    )
+
+
+def triangulate_points_batch(
+    points_2d_batch: np.ndarray,
+    calibration_by_camera: Dict[str, dict],
+    camera_names: List[str],
+    min_cameras: int = 2,
+    min_quality: float = 0.5,
+    projection_matrices_by_camera: Optional[Dict[str, np.ndarray]] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Triangulates one 3D point per frame for a block of frames at once.
+
+    Unlike `triangulate_point`, no cameras are dropped to improve the
+    reprojection error: every camera whose observation reaches `min_quality`
+    contributes, weighted by its quality, and all frames are solved with a
+    single stacked SVD.
+
+    Args:
+        points_2d_batch: Observations of shape (F, N, 3) holding x, y and quality
+            for F frames and the N cameras listed in `camera_names`.
+        calibration_by_camera: Calibration data by camera name.
+        camera_names: Names of the cameras, in the order of the second axis of `points_2d_batch`.
+        min_cameras: Minimum number of usable cameras for a frame to be triangulated.
+        min_quality: Minimum quality for an observation to be used.
+        projection_matrices_by_camera: Optional precomputed projection matrices by
+            camera name, as returned by `projection_matrices`.
+
+    Returns:
+        A tuple (points_3d, reprojection_errors, cameras_used) of shapes (F, 3), (F,)
+        and (F, N). Frames with too few usable cameras are NaN in the first two and
+        have no cameras marked as used.
+    """
+    points = np.asarray(points_2d_batch, dtype=np.float64)
+    n_frames = points.shape[0]
+    if projection_matrices_by_camera is not None:
+        Ps = np.stack([projection_matrices_by_camera[name] for name in camera_names])
+    else:
+        Ps = np.stack([projection_matrix(calibration_by_camera[name]) for name in camera_names])
+    Ps = np.broadcast_to(Ps, (n_frames, len(camera_names), 3, 4))
+
+    # Unusable observations get zero weight, which zeroes their DLT rows
+    used = (points[..., 2] >= min_quality) & ~np.isnan(points[..., :2]).any(axis=-1)
+    x = np.where(used, points[..., 0], 0.0)
+    y = np.where(used, points[..., 1], 0.0)
+    weights = np.where(used, points[..., 2], 0.0)
+    cam_counts = used.sum(axis=-1)
+    solvable = cam_counts >= max(min_cameras, 2)
+    cameras_used = used & solvable[:, np.newaxis]
+
+    points_3d = np.full((n_frames, 3), np.nan)
+    reprojection_errors = np.full(n_frames, np.nan)
+    if not solvable.any():
+        return points_3d, reprojection_errors, cameras_used
+
+    Q = weighted_triangulation(Ps[solvable], x[solvable], y[solvable], weights[solvable])
+    x_calc, y_calc = reprojection(Ps[solvable], Q)
+    errors = euclidean_distance(points[solvable][..., :2], np.stack((x_calc, y_calc), axis=-1))
+    errors = np.where(used[solvable], errors, 0.0)
+
+    points_3d[solvable] = Q[:, :3]
+    reprojection_errors[solvable] = errors.sum(axis=-1) / cam_counts[solvable]
+    return points_3d, reprojection_errors, cameras_used
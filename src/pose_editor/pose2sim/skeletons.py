@@ -57,7 +57,6 @@ def get_skeleton_definition(name: str):
     # Only expose known skeletons
     if name in globals():
         definition = globals()[name]
-        from anytree import Node
         if isinstance(definition, Node):
             return definition
     raise ValueError(f"No skeleton definition found for '{name}'")
@@ -9,11 +9,12 @@ import pytest
 
 from pose_editor.blender import dal, dal3d
 
+pytestmark = pytest.mark.blender
+
 
 @pytest.fixture(autouse=True)
-def clear_blender_data():
+def clear_blender_data(empty_factory_scene):
     """Fixture to clear all Blender data before each test."""
-    bpy.ops.wm.read_factory_settings(use_empty=True)
 
 
 def test_create_sphere_marker():
@@ -38,13 +39,13 @@ def test_create_sphere_marker():
     assert "TestSphere" in marker_obj.name
     assert marker_obj.parent == parent_obj._get_obj()
     assert len(marker_obj.data.materials) > 0
-    assert tuple(marker_obj.data.materials[0].diffuse_color[:3]) == pytest.approx(color[:3])
+    assert marker_obj.data.materials[0].diffuse_color[:3] == pytest.approx(color[:3])
     assert marker_obj.dimensions.x == pytest.approx(1.0) # Diameter
 
+@pytest.mark.skip(reason="Driver initialization currently broken")
 def test_add_object_driver():
     """Test that add_object_driver correctly creates a driver and variables."""
     # Arrange
-    pytest.skip(reason="Driver initialization currently broken")
     source1 = dal.create_empty(name="Source1", collection=bpy.context.scene.collection)
     source2 = dal.create_empty(name="Source2", collection=bpy.context.scene.collection)
     target = dal.create_empty(name="Target", collection=bpy.context.scene.collection)
@@ -62,13 +63,14 @@ def test_add_object_driver():
     dal3d.add_object_driver(target, "location", expression, variables, index=0)
 
     # Assert
-    # Check driver exists
-    driver = target._get_obj().animation_data.drivers.find("location", index=0)
+    # Check driver exists; drivers and variables are read once into dicts to keep RNA lookups down
+    drivers_by_key = {(fc.data_path, fc.array_index): fc for fc in target._get_obj().animation_data.drivers}
+    driver = drivers_by_key.get(("location", 0))
     assert driver is not None
     assert driver.driver.expression == expression
-    assert len(driver.driver.variables) == 2
-    assert driver.driver.variables[0].name == "var1"
-    assert driver.driver.variables[1].targets[0].id == source2._get_obj()
+    vars_by_name = {var.name: var for var in driver.driver.variables}
+    assert list(vars_by_name) == ["var1", "var2"]
+    assert vars_by_name["var2"].targets[0].id == source2._get_obj()
 
     # Check if the driver works
     bpy.context.view_layer.update()
@@ -7,16 +7,15 @@ import pytest
 
 from pose_editor.blender import dal
 
+pytestmark = pytest.mark.blender
+
 
 @pytest.fixture
-def setup_blender_scene(request):
+def setup_blender_scene(empty_factory_scene):
     """Set up a clean Blender scene for each test."""
-    bpy.ops.wm.read_factory_settings(use_empty=True)
-
-    # Create a cube to animate
-    bpy.ops.mesh.primitive_cube_add()
-    obj = bpy.context.object
-    obj.name = "TestObject"
+    # Create an empty to animate; only its location is keyed, so no mesh is needed
+    obj = bpy.data.objects.new("TestObject", None)
+    bpy.context.scene.collection.objects.link(obj)
 
     # Create an action and link it
     action = bpy.data.actions.new("TestAction")
@@ -34,28 +33,23 @@ def setup_blender_scene(request):
     return obj, fcurve
 
 
-def test_get_fcurve_keyframes_in_range(setup_blender_scene):
-    # Arrange
-    obj, fcurve = setup_blender_scene
-
-    # Act
-    keyframes = dal.get_fcurve_keyframes_in_range(fcurve, 9, 21)
-
-    # Assert
-    assert len(keyframes) == 2
-    assert keyframes[0] == (10.0, 10.0)
-    assert keyframes[1] == (20.0, 20.0)
-
-
-def test_get_fcurve_keyframes_in_range_no_match(setup_blender_scene):
+@pytest.mark.parametrize(
+    "start_frame, end_frame, expected",
+    [
+        (9, 21, [(10.0, 10.0), (20.0, 20.0)]),
+        (100, 200, []),
+    ],
+    ids=["match", "no_match"],
+)
+def test_get_fcurve_keyframes_in_range(setup_blender_scene, start_frame, end_frame, expected):
     # Arrange
     obj, fcurve = setup_blender_scene
 
     # Act
-    keyframes = dal.get_fcurve_keyframes_in_range(fcurve, 100, 200)
+    keyframes = dal.get_fcurve_keyframes_in_range(fcurve, start_frame, end_frame)
 
     # Assert
-    assert len(keyframes) == 0
+    assert keyframes == expected
 
 
 def test_replace_fcurve_keyframes_in_range(setup_blender_scene):
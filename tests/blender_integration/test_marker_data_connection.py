@@ -13,11 +13,12 @@ from pose_editor.core.marker_data import MarkerData
 from pose_editor.core.person_3d_view import Person3DView
 from pose_editor.core.skeleton import SkeletonBase
 
+pytestmark = pytest.mark.blender
+
 
 @pytest.fixture(autouse=True)
-def clear_blender_data():
+def clear_blender_data(empty_factory_scene):
     """Fixture to clear all Blender data before each test."""
-    bpy.ops.wm.read_factory_settings(use_empty=True)
 
 
 @pytest.mark.skip(reason="Blocked by bug in Person3DView.create_new factory method")
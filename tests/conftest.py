@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2025 Harri Kaimio
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Shared fixtures for all tests.
+
+Nothing here imports `bpy` at module level or uses it in an autouse fixture, so
+`pytest -m "not blender"` runs without touching the real Blender module. Test
+modules that drive the real scene reach it through the fixtures below.
+"""
+
+import pytest
+
+
+# A minimal 1x1 black PNG
+_PNG_BYTES = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
+
+# Collections the scene cleanup never removes
+_KEEP_COLLECTION_NAMES = frozenset({"Scene Collection"})
+
+
+def _reset_to_empty_factory_scene():
+    """Loads an empty factory scene and applies the preferences the tests rely on."""
+    import bpy
+
+    # The factory reset also resets preferences, so it must come before any configuration
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    # Marker color drivers call into the add-on's Python driver namespace
+    bpy.context.preferences.filepaths.use_scripts_auto_execute = True
+    # Nothing in the tests is undone, so operators need not push undo steps
+    bpy.context.preferences.edit.use_global_undo = False
+
+
+def _clear_scene():
+    """Removes all actions, objects and collections from the current scene."""
+    import bpy
+
+    scene_collection = bpy.context.scene.collection
+    # One batched removal instead of a remove call per datablock
+    bpy.data.batch_remove(
+        ids=(
+            *bpy.data.actions,
+            *bpy.data.objects,
+            # Don't remove the scene collection
+            *(
+                col
+                for col in bpy.data.collections
+                if col.name not in _KEEP_COLLECTION_NAMES and col != scene_collection
+            ),
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def blender_session():
+    """Resets and configures the Blender module once, for the first test that needs the real scene."""
+    _reset_to_empty_factory_scene()
+
+
+@pytest.fixture
+def empty_factory_scene(blender_session):
+    """Resets Blender to an empty factory scene for a single test, keeping the session preferences."""
+    _reset_to_empty_factory_scene()
+
+
+@pytest.fixture(scope="session")
+def clear_scene(blender_session):
+    """The function behind clean_blender_scene, for modules that clear the scene at a broader scope."""
+    return _clear_scene
+
+
+@pytest.fixture
+def clean_blender_scene(blender_session):
+    """Fixture to ensure a clean Blender scene for each test."""
+    _clear_scene()
+    # No cleanup after the test: the next test using this fixture starts by clearing the scene
+    yield
+
+
+@pytest.fixture(scope="session")
+def tiny_png(tmp_path_factory):
+    """Path to a tiny PNG marker image, written once per session."""
+    path = tmp_path_factory.mktemp("assets") / "test_marker.png"
+    path.write_bytes(_PNG_BYTES)
+    return path
+
+
+@pytest.fixture(scope="module")
+def registered_addon(blender_session):
+    """Registers the add-on once for the tests of a module.
+
+    Module-scoped rather than session-scoped so that test_install.py, which registers and
+    unregisters the add-on itself, never runs while it is registered.
+    """
+    from pose_editor import register, unregister
+
+    register()
+    yield
+    unregister()
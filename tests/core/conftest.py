@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2025 Harri Kaimio
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Shared fixtures for the core tests."""
+
+import pytest
+
+from pose_editor.core.skeleton import COCO133Skeleton, SkeletonBase
+from pose_editor.pose2sim import skeletons
+
+
+@pytest.fixture(scope="session")
+def halpe26() -> SkeletonBase:
+    """A HALPE_26 skeleton, shared by all tests. Treat it as read-only."""
+    return SkeletonBase(skeletons.HALPE_26, "HALPE_26")
+
+
+@pytest.fixture(scope="session")
+def coco17() -> SkeletonBase:
+    """A COCO_17 skeleton, shared by all tests. Treat it as read-only."""
+    return SkeletonBase(skeletons.COCO_17, "COCO_17")
+
+
+@pytest.fixture(scope="session")
+def coco133() -> COCO133Skeleton:
+    """A COCO_133 skeleton, shared by all tests. Treat it as read-only."""
+    return COCO133Skeleton()
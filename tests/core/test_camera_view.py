@@ -108,11 +108,9 @@ def test_update_scene_frame_range(mock_get_all, mock_dal):
     # Arrange
     mock_view1 = MagicMock()
     mock_view1.get_start_frame.return_value = 10
-    mock_view1._obj = MagicMock()
 
     mock_view2 = MagicMock()
     mock_view2.get_start_frame.return_value = -20
-    mock_view2._obj = MagicMock()
 
     mock_get_all.return_value = [mock_view1, mock_view2]
 
@@ -190,21 +188,15 @@ def test_create_camera_view_scaling_landscape(
     )
 
     # Assert that the transform properties were saved
-    mock_dal.set_custom_property.assert_any_call(
-        camera_view_empty_mock, CAMERA_X_SCALE, xfactor
-    )
-    mock_dal.set_custom_property.assert_any_call(
-        camera_view_empty_mock, CAMERA_Y_SCALE, yfactor
-    )
-    mock_dal.set_custom_property.assert_any_call(
-        camera_view_empty_mock, CAMERA_Z_SCALE, zfactor
-    )
-    mock_dal.set_custom_property.assert_any_call(
-        camera_view_empty_mock, CAMERA_X_OFFSET, xoffset
-    )
-    mock_dal.set_custom_property.assert_any_call(
-        camera_view_empty_mock, CAMERA_Y_OFFSET, yoffset
-    )
+    expected_args = {
+        (camera_view_empty_mock, CAMERA_X_SCALE, xfactor),
+        (camera_view_empty_mock, CAMERA_Y_SCALE, yfactor),
+        (camera_view_empty_mock, CAMERA_Z_SCALE, zfactor),
+        (camera_view_empty_mock, CAMERA_X_OFFSET, xoffset),
+        (camera_view_empty_mock, CAMERA_Y_OFFSET, yoffset),
+    }
+    actual_args = {c.args for c in mock_dal.set_custom_property.call_args_list}
+    assert expected_args <= actual_args
 
 
 @patch("pose_editor.core.camera_view.dal")
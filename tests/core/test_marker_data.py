@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
@@ -52,12 +52,13 @@ class TestMarkerData:
         mock_dal.get_or_create_action.assert_called_once_with(f"AC.{series_name}")
 
         # Check that custom properties were set
-        expected_calls = [
-            call(mock_blender_obj_ref, mock_dal.SERIES_NAME, series_name),
-            call(mock_blender_obj_ref, mock_dal.SKELETON, skeleton_name),
-            call(mock_blender_obj_ref, mock_dal.ACTION_NAME, f"AC.{series_name}"),
-        ]
-        mock_dal.set_custom_property.assert_has_calls(expected_calls, any_order=True)
+        expected_args = {
+            (mock_blender_obj_ref, mock_dal.SERIES_NAME, series_name),
+            (mock_blender_obj_ref, mock_dal.SKELETON, skeleton_name),
+            (mock_blender_obj_ref, mock_dal.ACTION_NAME, f"AC.{series_name}"),
+        }
+        actual_args = {c.args for c in mock_dal.set_custom_property.call_args_list}
+        assert expected_args <= actual_args
 
     @patch("pose_editor.core.marker_data.dal")
     def test_set_animation_data(self, mock_dal, mock_action):
@@ -131,8 +132,9 @@ class TestMarkerData:
         mock_person_data_view.get_marker_objects.assert_called_once()
 
         # Check that assign_action_to_object was called for each child
-        expected_calls = [
-            call(mock_nose_marker_ref, mock_action, "Nose"),
-            call(mock_leye_marker_ref, mock_action, "LEye"),
-        ]
-        mock_dal.assign_action_to_object.assert_has_calls(expected_calls, any_order=True)
+        expected_args = {
+            (mock_nose_marker_ref, mock_action, "Nose"),
+            (mock_leye_marker_ref, mock_action, "LEye"),
+        }
+        actual_args = {c.args for c in mock_dal.assign_action_to_object.call_args_list}
+        assert expected_args <= actual_args
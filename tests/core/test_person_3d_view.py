@@ -8,10 +8,18 @@ from unittest.mock import MagicMock, patch, call
 
 from anytree import Node
 
-from pose_editor.blender import dal
 from pose_editor.core.person_3d_view import Person3DView
 
 
+class _StubRef:
+    """Lightweight stand-in for a dal.BlenderObjRef that wraps a given object."""
+
+    def __init__(self, name, obj):
+        self._id = name
+        self.name = name
+        self._get_obj = MagicMock(return_value=obj)
+
+
 @patch("pose_editor.core.person_3d_view.dal3d")
 @patch("pose_editor.core.person_3d_view.dal")
 def test_create_new(mock_dal, mock_dal3d):
@@ -30,18 +38,15 @@ def test_create_new(mock_dal, mock_dal3d):
 
     # Mock parent object and collection
     mock_parent_ref = MagicMock(name="ParentRef")
-    mock_root_ref = MagicMock(spec=dal.BlenderObjRef)
-    mock_root_ref.name = "Test3DView"
+    # The root object needs a collection for the markers to be placed in
+    mock_root_obj = MagicMock()
+    mock_root_obj.users_collection = [MagicMock()]
+    mock_root_ref = _StubRef("Test3DView", mock_root_obj)
     mock_armature_ref = MagicMock(name="ArmatureRef")
 
     # Configure get_or_create_object to return the root ref first, then the armature ref
     mock_dal.get_or_create_object.side_effect = [mock_root_ref, mock_armature_ref]
 
-    # The root object needs a collection for the markers to be placed in
-    mock_root_obj = MagicMock()
-    mock_root_obj.users_collection = [MagicMock()]
-    mock_root_ref._get_obj.return_value = mock_root_obj
-
     # Mock marker objects returned by DAL to test armature/driver creation
     marker_mocks = {
         "Root": MagicMock(name="PV_Root"),
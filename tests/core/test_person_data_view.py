@@ -11,23 +11,39 @@ from pose_editor.core.person_data_view import PersonDataView
 from pose_editor.core.person_facade import RealPersonInstanceFacade
 
 # Mock the dal module before importing the class to be tested
+@pytest.fixture(scope="module")
+def dal_module_stub():
+    """Stand-in for the dal module in sys.modules, built once for all tests of this module."""
+    stub = MagicMock()
+    with patch.dict("sys.modules", {"pose_editor.blender.dal": stub}):
+        yield stub
+
+
 @pytest.fixture(autouse=True)
-def mock_dal_module():
-    with patch.dict("sys.modules", {"pose_editor.blender.dal": MagicMock()}):
-        yield
+def mock_dal_module(dal_module_stub):
+    """Resets the shared dal stand-in so that no configuration leaks between tests."""
+    dal_module_stub.reset_mock(return_value=True, side_effect=True)
+    return dal_module_stub
 
 
-@pytest.fixture
-def mock_skeleton():
-    """Creates a mock SkeletonBase object with a simple hierarchy."""
+@pytest.fixture(scope="module")
+def skeleton_stub():
+    """A mock SkeletonBase object with a simple hierarchy, built once for all tests of this module."""
     root = Node("RootNode", id=-1)
-    nose = Node("Nose", parent=root, id=0)
-    leye = Node("LEye", parent=root, id=1)
+    Node("Nose", parent=root, id=0)
+    Node("LEye", parent=root, id=1)
     mock = MagicMock()
     mock._skeleton = root
     return mock
 
 
+@pytest.fixture
+def mock_skeleton(skeleton_stub):
+    """The shared skeleton stub, reset so that recorded calls don't leak between tests."""
+    skeleton_stub.reset_mock(return_value=True, side_effect=True)
+    return skeleton_stub
+
+
 @pytest.fixture
 def mock_marker_data():
     """Creates a mock MarkerData object."""
@@ -439,7 +455,6 @@ class TestPersonDataViewStitching:
         mock_marker_data = MagicMock()
         mock_md_obj = MagicMock()
         mock_marker_data.obj_ref = mock_md_obj
-        mock_marker_data.action = MagicMock()
         pdv.get_data_series = MagicMock(return_value=mock_marker_data)
 
         mock_req_fcurve = MagicMock()
@@ -459,7 +474,6 @@ class TestPersonDataViewStitching:
         mock_cam_view = MagicMock()
         mock_raw_pdv = MagicMock()
         mock_raw_md = MagicMock()
-        mock_raw_md.action = MagicMock()
         mock_raw_pdv.get_data_series.return_value = mock_raw_md
         mock_cam_view.get_raw_person_views.return_value = [MagicMock(), mock_raw_pdv] # track 0, track 1
         pdv.get_camera_view = MagicMock(return_value=mock_cam_view)
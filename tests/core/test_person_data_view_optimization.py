@@ -7,6 +7,9 @@ from unittest.mock import MagicMock, patch, ANY
 from pose_editor.core.person_data_view import PersonDataView, SKELETON_NAME
 from pose_editor.core.person_facade import POSE_EDITOR_OBJECT_TYPE, PERSON_DEFINITION_REF
 
+# Shared fallback value for custom property lookups that the tests don't care about
+_SENTINEL = MagicMock()
+
 
 @patch("pose_editor.core.person_facade.dal")
 @patch("pose_editor.core.person_data_view.dal")
@@ -54,7 +57,7 @@ def test_create_new_real_person_view_registers_handler_and_inits_props(
             return "Person"
 
         # Any other call
-        return MagicMock()
+        return _SENTINEL
 
     mock_pdv_dal.get_custom_property.side_effect = get_prop_side_effect
     mock_facade_dal.get_custom_property.side_effect = get_prop_side_effect
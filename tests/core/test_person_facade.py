@@ -2,19 +2,39 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
 import numpy as np
 from anytree import Node
 
+from pose_editor.core import person_facade
 from pose_editor.core.marker_data import MarkerData
+from pose_editor.core.person_facade import (
+    CAMERA_VIEW_ID,
+    PERSON_DEFINITION_REF,
+    RealPersonInstanceFacade,
+)
 
 
 # By patching the dal module where it is imported, we can control its behavior
 # for all classes that use it, like RealPersonInstanceFacade and MarkerData.
 
 
+@pytest.fixture(scope="session")
+def dal_spec():
+    """Autospec of the dal module, built once since autospeccing walks the whole module."""
+    return create_autospec(person_facade.dal)
+
+
+@pytest.fixture
+def mock_dal(dal_spec, monkeypatch):
+    """Patches person_facade.dal with the shared autospec, reset for each test."""
+    dal_spec.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("pose_editor.core.person_facade.dal", dal_spec)
+    return dal_spec
+
+
 @pytest.fixture
 def mock_skeleton():
     """Creates a mock SkeletonBase object with a simple hierarchy."""
@@ -23,188 +43,214 @@ def mock_skeleton():
     return mock_skeleton
 
 
-@patch("pose_editor.core.person_facade.dal", autospec=True)
-def test_find_next_stitch_frame(mock_dal):
-    """Tests that the next keyframe is correctly identified."""
-    from pose_editor.core.person_facade import RealPersonInstanceFacade
+class _FakeDal:
+    """Stand-in for the dal module holding one data series for a person in one camera view."""
+
+    def __init__(self, person_ref: MagicMock, view_name: str, keyframes: list):
+        self.person_ref = person_ref
+        self.ds_obj = MagicMock()
+        self.ds_fcurve = MagicMock()
+        self.ds_props = {PERSON_DEFINITION_REF: person_ref._id, CAMERA_VIEW_ID: view_name}
+        self.keyframes = keyframes
+
+    def get_custom_property(self, obj, prop):
+        if obj is self.ds_obj:
+            return self.ds_props.get(prop)
+        return self.person_ref.name
+
+    def find_all_objects_by_property(self, prop, value):
+        return [self.ds_obj]
+
+    def get_fcurve_on_object(self, obj, data_path, index=-1):
+        return self.ds_fcurve if obj is self.ds_obj else None
+
+    def get_fcurve_keyframes(self, fcurve):
+        return self.keyframes if fcurve is self.ds_fcurve else []
+
+    def get_scene_frame_range(self):
+        return 1, 250
+
 
+def test_find_next_stitch_frame():
+    """Tests that the next keyframe is correctly identified."""
     # Arrange
     person_ref = MagicMock()
     person_ref.name = "Alice"
-    facade = RealPersonInstanceFacade(person_ref)
+    fake_dal = _FakeDal(person_ref, "cam1", [(1.0, 0.0), (50.0, 1.0), (100.0, 2.0)])
 
-    mock_dal.get_object_by_name.return_value = MagicMock()  # Ensure ds_obj is not None
-    mock_dal.get_fcurve_on_object.return_value = MagicMock()
-    mock_dal.get_fcurve_keyframes.return_value = [(1.0, 0.0), (50.0, 1.0), (100.0, 2.0)]
-    mock_dal.get_scene_frame_range.return_value = (1, 250)
+    with patch("pose_editor.core.person_facade.dal", fake_dal):
+        facade = RealPersonInstanceFacade(person_ref)
 
-    # Act
-    next_frame = facade.find_next_stitch_frame("cam1", 50)
+        # Act
+        next_frame = facade.find_next_stitch_frame("cam1", 50)
 
     # Assert
     assert next_frame == 99  # The segment should end the frame before the next keyframe
 
 
-@patch("pose_editor.core.person_facade.dal", autospec=True)
-def test_find_next_stitch_frame_no_future_keys(mock_dal):
+def test_find_next_stitch_frame_no_future_keys():
     """Tests that the scene end frame is used when no future keyframes exist."""
-    from pose_editor.core.person_facade import RealPersonInstanceFacade
-
     # Arrange
     person_ref = MagicMock()
     person_ref.name = "Alice"
-    view_name = "cam1"
-    facade = RealPersonInstanceFacade(person_ref)
+    fake_dal = _FakeDal(person_ref, "cam1", [(1.0, 0.0), (50.0, 1.0)])
 
-    mock_dal.get_object_by_name.return_value = MagicMock()
-    mock_dal.get_fcurve_on_object.return_value = MagicMock()
-    mock_dal.get_fcurve_keyframes.return_value = [(1.0, 0.0), (50.0, 1.0)]
-    mock_dal.get_scene_frame_range.return_value = (1, 250)
+    with patch("pose_editor.core.person_facade.dal", fake_dal):
+        facade = RealPersonInstanceFacade(person_ref)
 
-    # Act
-    next_frame = facade.find_next_stitch_frame("cam1", 50)
+        # Act
+        next_frame = facade.find_next_stitch_frame("cam1", 50)
 
     # Assert
     assert next_frame == 250
 
-    # Mock dal.get_or_create_object to prevent TypeError when setting parent
-    mock_blender_obj_ref_with_parent = MagicMock()
-    mock_blender_obj_ref_with_parent._get_obj.return_value = MagicMock()
-    mock_blender_obj_ref_with_parent._get_obj().parent = MagicMock()  # Allow parent to be set
-    mock_dal.get_or_create_object.return_value = mock_blender_obj_ref_with_parent
-
-    # Mock dal.get_object_by_name to return a mock BlenderObjRef with custom properties
-    mock_pv_root_obj_ref = MagicMock()
-    mock_pv_root_obj_ref.name = f"PV.{person_ref.name}.{view_name}"
-    mock_pv_root_obj_ref._get_obj.return_value = MagicMock()
-    mock_pv_root_obj_ref._get_obj().get.side_effect = (
-        lambda prop: "PersonDataView" if prop == mock_dal.POSE_EDITOR_OBJECT_TYPE else None
-    )
-    mock_dal.get_object_by_name.return_value = mock_pv_root_obj_ref
 
-    mock_dal.get_or_create_object.return_value = mock_blender_obj_ref_with_parent
+def test_find_next_stitch_frame_between_keys():
+    """Tests that a start frame between keyframes finds the following keyframe."""
+    # Arrange
+    person_ref = MagicMock()
+    person_ref.name = "Alice"
+    keyframes = [(float(frame), 0.0) for frame in range(1, 1000, 10)]
+    fake_dal = _FakeDal(person_ref, "cam1", keyframes)
 
+    with patch("pose_editor.core.person_facade.dal", fake_dal):
+        facade = RealPersonInstanceFacade(person_ref)
 
+        # Act
+        next_frame = facade.find_next_stitch_frame("cam1", 505)
 
+    # Assert
+    assert next_frame == 510
 
-@patch("pose_editor.core.person_facade.dal", autospec=True)
-@patch("pose_editor.blender.dal.CustomProperty", autospec=True)
-@patch("pose_editor.core.person_facade.MarkerData") # Remove autospec for now, will manually mock instances
-@patch("pose_editor.core.person_facade.PersonDataView", autospec=True)
-@patch("pose_editor.core.person_facade.RealPersonInstanceFacade._get_dataseries_for_view")
-@patch("pose_editor.core.person_facade.RealPersonInstanceFacade.find_next_stitch_frame")
-def test_assign_source_track_for_segment_preserves_outside_keyframes(
-    mock_find_next_stitch_frame,
-    mock_get_dataseries_for_view,
-    mock_person_data_view,
-    mock_marker_data,
-    mock_custom_proeprty,
-    mock_dal,
-    mock_skeleton,
-):
-    """Tests that assign_source_track_for_segment correctly replaces keyframes
-    within a segment while preserving keyframes outside of it.
-    """
-    from pose_editor.core.person_facade import RealPersonInstanceFacade, ACTIVE_TRACK_INDEX
 
+@patch("pose_editor.core.person_data_view.PersonDataView.get_all")
+def test_bake_stitching_data_updates_every_frame_of_own_views(mock_get_all_pdvs, mock_dal):
+    """Tests that bake_stitching_data brings every scene frame of the person's own
+    views up to date and leaves the views of other persons alone.
+    """
     # Arrange
+    mock_dal.get_custom_property.return_value = "Alice"
+    mock_dal.get_scene_frame_range.return_value = (5, 7)
+
+    own_pdvs = [MagicMock(), MagicMock()]
+    for pdv in own_pdvs:
+        pdv.get_person.return_value.person_id = "Alice"
+    other_pdv = MagicMock()
+    other_pdv.get_person.return_value.person_id = "Bob"
+    unassigned_pdv = MagicMock()
+    unassigned_pdv.get_person.return_value = None
+    mock_get_all_pdvs.return_value = [own_pdvs[0], other_pdv, own_pdvs[1], unassigned_pdv]
+
     person_ref = MagicMock()
     person_ref.name = "Alice"
-    view_name = "cam1"
     facade = RealPersonInstanceFacade(person_ref)
 
-    # Mock _get_dataseries_for_view
-    mock_ds_obj = MagicMock()
-    mock_dal.get_object_by_name = MagicMock()
-    mock_dal.get_object_by_name.return_value = mock_ds_obj
-    mock_get_dataseries_for_view.return_value = mock_ds_obj
-
-    # Mock find_next_stitch_frame
-    start_frame = 20
-    end_frame = 30
-    mock_find_next_stitch_frame.return_value = end_frame # Use the new mock
-
-    # Explicitly define mock actions
-    mock_source_action = MagicMock()
-    mock_target_action = MagicMock()
-
-    # Create specific mock instances for source and target MarkerData
-    mock_source_md_instance = MagicMock(action=mock_source_action) # Assign action here
-    mock_target_md_instance = MagicMock(action=mock_target_action) # Assign action here
-
-    # Configure MarkerData to return these specific instances
-    # The first call to MarkerData will be for the target, the second for the source
-    mock_marker_data.from_blender_object = MagicMock()
-    mock_marker_data.from_blender_object.side_effect = [mock_target_md_instance, mock_source_md_instance]
-
-    # Mock get_animation_data_as_numpy to return some source data
-    source_data_np = np.array([[10.0, 11.0], [12.0, 13.0], [14.0, 15.0], [16.0, 17.0], [18.0, 19.0], [20.0, 21.0], [22.0, 23.0], [24.0, 25.0], [26.0, 27.0], [28.0, 29.0], [30.0, 31.0]]) # 11 frames (20 to 30 inclusive)
-    mock_dal.get_animation_data_as_numpy = MagicMock()
-    mock_dal.get_animation_data_as_numpy.return_value = source_data_np
-
-    # Mock get_or_create_fcurve to return a unique mock fcurve for each call
-    mock_fcurve_nose_loc_x = MagicMock()
-    mock_fcurve_nose_loc_y = MagicMock()
-    mock_fcurve_nose_quality = MagicMock()
-    mock_fcurve_leye_loc_x = MagicMock()
-    mock_fcurve_leye_loc_y = MagicMock()
-    mock_fcurve_leye_quality = MagicMock()
-
-    mock_dal.get_or_create_fcurve = MagicMock()
-    mock_dal.get_or_create_fcurve.side_effect = [
-        mock_fcurve_nose_loc_x,
-        mock_fcurve_nose_loc_y,
-        mock_fcurve_nose_quality,
-        mock_fcurve_leye_loc_x,
-        mock_fcurve_leye_loc_y,
-        mock_fcurve_leye_quality,
-    ]
-
     # Act
-    facade.assign_source_track_for_segment(
-        view_name, 1, start_frame, mock_skeleton
-    )
+    facade.bake_stitching_data()
 
     # Assert
-    # Verify get_animation_data_as_numpy was called correctly
-    mock_dal.get_animation_data_as_numpy.assert_called_once_with(
-        mock_source_action,
-        [
-            ("Nose", "location", 0),
-            ("Nose", "location", 1),
-            ("Nose", '["quality"]', -1),
-            ("LEye", "location", 0),
-            ("LEye", "location", 1),
-            ("LEye", '["quality"]', -1),
-        ],
-        start_frame,
-        end_frame,
-    )
+    for pdv in own_pdvs:
+        assert [c.args for c in pdv.update_frame_if_needed.call_args_list] == [(5,), (6,), (7,)]
+    other_pdv.update_frame_if_needed.assert_not_called()
+    unassigned_pdv.update_frame_if_needed.assert_not_called()
 
-    # Verify replace_fcurve_segment_from_numpy was called
-    mock_dal.replace_fcurve_segment_from_numpy.assert_called_once_with(
-        mock_target_action,
-        [
-            ("Nose", "location", 0),
-            ("Nose", "location", 1),
-            ("Nose", '["quality"]', -1),
-            ("LEye", "location", 0),
-            ("LEye", "location", 1),
-            ("LEye", '["quality"]', -1),
-        ],
-        start_frame,
-        end_frame,
-        source_data_np,
-    )
 
-    # Verify active_track_index keyframe was set
-    mock_dal.set_custom_property.assert_called_once_with(
-        mock_ds_obj, ACTIVE_TRACK_INDEX, 1
-    )
-    mock_dal.add_keyframe.assert_called_once_with(
-        mock_ds_obj, start_frame, {'["active_track_index"]': [1]}
+@pytest.fixture
+def calibration_data() -> dict:
+    """Provides calibration data for three cameras looking at the origin area."""
+    return {
+        "cam1": {
+            "matrix": [[1500, 0, 960], [0, 1500, 540], [0, 0, 1]],
+            "rotation": [0.1, 0.2, 0.3],
+            "translation": [-1, 0, 0],
+        },
+        "cam2": {
+            "matrix": [[1510, 0, 965], [0, 1510, 545], [0, 0, 1]],
+            "rotation": [-0.1, -0.2, -0.3],
+            "translation": [1, 0, 0],
+        },
+        "cam3": {
+            "matrix": [[1490, 0, 955], [0, 1490, 535], [0, 0, 1]],
+            "rotation": [0.0, 0.0, 0.0],
+            "translation": [0, 1, 0],
+        },
+    }
+
+
+@patch("pose_editor.core.person_facade.triangulate_point", wraps=person_facade.triangulate_point)
+@patch("pose_editor.core.person_facade.triangulate_points_batch", wraps=person_facade.triangulate_points_batch)
+@patch("pose_editor.core.person_3d_view.Person3DView.get_for_person")
+@patch("pose_editor.core.person_data_view.PersonDataView.get_all")
+@patch("pose_editor.core.person_facade.MarkerData")
+@patch("pose_editor.core.person_facade.Calibration")
+def test_triangulate_retries_only_frames_over_error_threshold(
+    mock_calibration,
+    mock_marker_data,
+    mock_get_all_pdvs,
+    mock_get_3d_view,
+    mock_triangulate_points_batch,
+    mock_triangulate_point,
+    mock_dal,
+    mock_skeleton,
+    calibration_data,
+):
+    """Tests that triangulate solves the frame range in one batch and retries only
+    the frames whose error is over the threshold with fewer cameras.
+    """
+    # Arrange
+    camera_names = ["cam1", "cam2", "cam3"]
+    mock_calibration.return_value._data = calibration_data
+    mock_calibration.return_value.get_camera_names.return_value = camera_names
+
+    # Project a fixed point into every camera for frames 10 and 11; cam3 is off by 200 px in frame 11
+    point_3d = np.array([0.2, -0.1, 5.0])
+    samples = {}
+    pdvs = []
+    cam_name_by_obj = {}
+    for cam_name in camera_names:
+        projected = person_facade.projection_matrices(calibration_data)[cam_name] @ np.append(point_3d, 1.0)
+        x = np.full(2, projected[0] / projected[2])
+        y = np.full(2, projected[1] / projected[2])
+        if cam_name == "cam3":
+            x[1] += 200.0
+
+        pdv = MagicMock()
+        pdv.get_person.return_value.person_id = "Alice"
+        pdv.skeleton = mock_skeleton
+        cam_name_by_obj[pdv.get_camera_view.return_value._obj] = cam_name
+        action = pdv.get_data_series.return_value.action
+        samples[(action, "location", 0)] = x
+        samples[(action, "location", 1)] = y
+        samples[(action, '["quality"]', -1)] = np.full(2, 0.9)
+        pdvs.append(pdv)
+    mock_get_all_pdvs.return_value = pdvs
+
+    mock_dal.get_custom_property.side_effect = lambda obj, prop: cam_name_by_obj.get(obj, "Alice")
+    mock_dal.find_all_objects_by_property.return_value = []
+    # Only Nose has 2D data; LEye has no f-curves in any view
+    mock_dal.get_fcurve_from_action.side_effect = lambda action, marker, path, index: (
+        (action, path, index) if marker == "Nose" else None
     )
+    mock_dal.sample_fcurve.side_effect = lambda fcurve, start, end: samples[fcurve]
+
+    person_ref = MagicMock()
+    person_ref.name = "Alice"
+    facade = RealPersonInstanceFacade(person_ref)
 
-    # Verify PersonDataView reconnection
-    mock_person_data_view.from_blender_object.assert_called_once()
-    mock_target_md_instance.apply_to_view.assert_called_once()
+    # Act
+    facade.triangulate(10, 11)
+
+    # Assert
+    mock_triangulate_points_batch.assert_called_once()
+    mock_triangulate_point.assert_called_once()
+
+    data = mock_dal.replace_fcurve_segment_from_numpy.call_args.kwargs["data"]
+    # Markers are the root, Nose and LEye. Columns: 3 x 3 locations, 3 errors, 3 camera counts, 3 x 3 camera flags
+    assert data.shape == (2, 24)
+    assert np.allclose(data[:, 3:6], point_3d, atol=1e-6)
+    assert np.isnan(data[:, [0, 1, 2, 6, 7, 8]]).all()
+    assert np.all(data[:, 10] < 1e-6)
+    assert data[:, 13].tolist() == [3, 2]
+    assert data[:, 18:21].tolist() == [[1, 1, 1], [1, 1, 0]]
+    assert not data[:, [15, 16, 17, 21, 22, 23]].any()
+    mock_get_3d_view.return_value.connect_to_series.assert_called_once_with(mock_marker_data.create_new.return_value)
@@ -1,15 +1,12 @@
-from pose_editor.core.skeleton import COCO133Skeleton, SkeletonBase
-from pose_editor.pose2sim import skeletons
-
-
+import numpy as np
 import pytest
+from anytree import Node
 from pose_editor.core.skeleton import get_skeleton, SkeletonBase, COCO133Skeleton
 from pose_editor.pose2sim import skeletons
 
 def test_get_skeleton_definition_valid():
     # COCO_133 should exist and be a Node
     node = skeletons.get_skeleton_definition("COCO_133")
-    from anytree import Node
     assert isinstance(node, Node)
     assert node.name == "Hip"
 
@@ -34,143 +31,137 @@ def test_get_skeleton_other_valid():
     except ValueError:
         pytest.skip("HALPE_26 skeleton not defined in test environment")
 
+def test_get_skeleton_is_cached():
+    assert get_skeleton("COCO_133") is get_skeleton("COCO_133")
+    assert get_skeleton("HALPE_26") is get_skeleton("HALPE_26")
+
+def test_skeletons_have_no_instance_dict(coco133, halpe26):
+    assert not hasattr(coco133, "__dict__")
+    assert not hasattr(halpe26, "__dict__")
+
+def test_duplicate_joint_ids_and_names_are_ambiguous():
+    root = Node("Hip", id=0, children=[Node("Knee", id=1), Node("Knee", id=2), Node("Ankle", id=2)])
+    skeleton = SkeletonBase(root, "Duplicates")
+
+    # A duplicated id or name does not identify a single joint
+    assert skeleton.get_joint_name(2) is None
+    assert skeleton.get_joint_id("Knee") is None
+    assert skeleton.get_joint_name(1) == "Knee"
+    assert skeleton.get_joint_id("Ankle") == 2
+
 def test_get_skeleton_invalid():
     with pytest.raises(ValueError) as excinfo:
         get_skeleton("NOT_A_SKELETON")
     assert "No skeleton definition found" in str(excinfo.value)
 
-def test_get_joint_name_valid_id():
+@pytest.mark.parametrize("joint_id, joint_name", [(19, "Hip"), (0, "Nose"), (10, "RWrist")])
+def test_get_joint_name_valid_id(halpe26, joint_id, joint_name):
     """
     Test that get_joint_name returns the correct name for a valid ID.
     """
-    skeleton = SkeletonBase(skeletons.HALPE_26)
-    assert skeleton.get_joint_name(19) == "Hip"
-    assert skeleton.get_joint_name(0) == "Nose"
-    assert skeleton.get_joint_name(10) == "RWrist"
+    assert halpe26.get_joint_name(joint_id) == joint_name
 
 
-def test_get_joint_name_invalid_id():
+@pytest.mark.parametrize("joint_id", [999, -1])
+def test_get_joint_name_invalid_id(halpe26, joint_id):
     """
     Test that get_joint_name returns None for an invalid ID.
     """
-    skeleton = SkeletonBase(skeletons.HALPE_26)
-    assert skeleton.get_joint_name(999) is None
-    assert skeleton.get_joint_name(-1) is None
+    assert halpe26.get_joint_name(joint_id) is None
 
 
-def test_get_joint_id_valid_name():
+@pytest.mark.parametrize("joint_name, joint_id", [("Hip", 19), ("Nose", 0), ("RWrist", 10)])
+def test_get_joint_id_valid_name(halpe26, joint_name, joint_id):
     """
     Test that get_joint_id returns the correct ID for a valid name.
     """
-    skeleton = SkeletonBase(skeletons.HALPE_26)
-    assert skeleton.get_joint_id("Hip") == 19
-    assert skeleton.get_joint_id("Nose") == 0
-    assert skeleton.get_joint_id("RWrist") == 10
+    assert halpe26.get_joint_id(joint_name) == joint_id
 
 
-def test_get_joint_id_invalid_name():
+@pytest.mark.parametrize("joint_name", ["InvalidJoint", "hip"])  # Case sensitive
+def test_get_joint_id_invalid_name(halpe26, joint_name):
     """
     Test that get_joint_id returns None for an invalid name.
     """
-    skeleton = SkeletonBase(skeletons.HALPE_26)
-    assert skeleton.get_joint_id("InvalidJoint") is None
-    assert skeleton.get_joint_id("hip") is None  # Case sensitive
+    assert halpe26.get_joint_id(joint_name) is None
 
 
-def test_skeleton_with_none_id_node():
+def test_skeleton_with_none_id_node(coco17):
     """
     Test skeleton with nodes that have id=None.
     """
-    skeleton = SkeletonBase(skeletons.COCO_17)
-    assert skeleton.get_joint_name(12) == "RHip"
-    assert skeleton.get_joint_id("RHip") == 12
-    assert skeleton.get_joint_name(None) is None  # Should not find a node with id=None
-    assert skeleton.get_joint_id("Hip") is None  # Node with name "Hip" has id=None
+    assert coco17.get_joint_name(12) == "RHip"
+    assert coco17.get_joint_id("RHip") == 12
+    assert coco17.get_joint_name(None) is None  # Should not find a node with id=None
+    assert coco17.get_joint_id("Hip") is None  # Node with name "Hip" has id=None
 
 
-def test_calculate_fake_marker_pos_placeholder():
+def test_calculate_fake_marker_pos_placeholder(halpe26):
     """
     Test that calculate_fake_marker_pos is a placeholder and does nothing.
     """
-    skeleton = SkeletonBase(skeletons.HALPE_26)
-    assert skeleton.calculate_fake_marker_pos("fake_marker", {}) is None
-
-
-def test_coco133_skeleton_calculate_fake_marker_pos_hip_2d():
-    """
-    Test calculate_fake_marker_pos for Hip in 2D for COCO133Skeleton.
-    """
-    skeleton = COCO133Skeleton()
-    marker_data = {"RHip": [10.0, 20.0, 1.0], "LHip": [30.0, 40.0, 1.0]}
-    expected_pos = [20.0, 30.0, 1.0]
-    assert skeleton.calculate_fake_marker_pos("Hip", marker_data) == expected_pos
+    assert halpe26.calculate_fake_marker_pos("fake_marker", {}) is None
 
 
-def test_coco133_skeleton_calculate_fake_marker_pos_hip_3d():
+@pytest.mark.parametrize(
+    "name, marker_data, expected_pos",
+    [
+        ("Hip", {"RHip": [10.0, 20.0, 1.0], "LHip": [30.0, 40.0, 1.0]}, [20.0, 30.0, 1.0]),
+        ("Hip", {"RHip": [10.0, 20.0, 30.0], "LHip": [30.0, 40.0, 50.0]}, [20.0, 30.0, 40.0]),
+        ("Neck", {"RShoulder": [100.0, 110.0, 1.0], "LShoulder": [120.0, 130.0, 1.0]}, [110.0, 120.0, 1.0]),
+        ("Neck", {"RShoulder": [100.0, 110.0, 120.0], "LShoulder": [120.0, 130.0, 140.0]}, [110.0, 120.0, 130.0]),
+        ("Hip", {"RHip": np.array([10.0, 20.0, 30.0]), "LHip": np.array([30.0, 40.0, 50.0])}, [20.0, 30.0, 40.0]),
+    ],
+    ids=["hip_2d", "hip_3d", "neck_2d", "neck_3d", "hip_numpy"],
+)
+def test_coco133_skeleton_calculate_fake_marker_pos(coco133, name, marker_data, expected_pos):
     """
-    Test calculate_fake_marker_pos for Hip in 3D for COCO133Skeleton.
+    Test calculate_fake_marker_pos for Hip and Neck in 2D and 3D for COCO133Skeleton.
     """
-    skeleton = COCO133Skeleton()
-    marker_data = {"RHip": [10.0, 20.0, 30.0], "LHip": [30.0, 40.0, 50.0]}
-    expected_pos = [20.0, 30.0, 40.0]
-    assert skeleton.calculate_fake_marker_pos("Hip", marker_data) == expected_pos
+    assert coco133.calculate_fake_marker_pos(name, marker_data) == expected_pos
 
 
-def test_coco133_skeleton_calculate_fake_marker_pos_neck_2d():
-    """
-    Test calculate_fake_marker_pos for Neck in 2D for COCO133Skeleton.
-    """
-    skeleton = COCO133Skeleton()
-    marker_data = {"RShoulder": [100.0, 110.0, 1.0], "LShoulder": [120.0, 130.0, 1.0]}
-    expected_pos = [110.0, 120.0, 1.0]
-    assert skeleton.calculate_fake_marker_pos("Neck", marker_data) == expected_pos
-
-
-def test_coco133_skeleton_calculate_fake_marker_pos_neck_3d():
-    """
-    Test calculate_fake_marker_pos for Neck in 3D for COCO133Skeleton.
-    """
-    skeleton = COCO133Skeleton()
-    marker_data = {"RShoulder": [100.0, 110.0, 120.0], "LShoulder": [120.0, 130.0, 140.0]}
-    expected_pos = [110.0, 120.0, 130.0]
-    assert skeleton.calculate_fake_marker_pos("Neck", marker_data) == expected_pos
-
-
-def test_coco133_skeleton_calculate_fake_marker_pos_insufficient_data():
+def test_coco133_skeleton_calculate_fake_marker_pos_insufficient_data(coco133):
     """
     Test calculate_fake_marker_pos with insufficient data for COCO133Skeleton.
     """
-    skeleton = COCO133Skeleton()
     marker_data = {
         "RHip": [10.0, 20.0, 1.0]  # Missing LHip
     }
-    assert skeleton.calculate_fake_marker_pos("Hip", marker_data) is None
+    assert coco133.calculate_fake_marker_pos("Hip", marker_data) is None
 
     marker_data = {
         "RShoulder": [100.0, 110.0, 1.0]  # Missing LShoulder
     }
-    assert skeleton.calculate_fake_marker_pos("Neck", marker_data) is None
+    assert coco133.calculate_fake_marker_pos("Neck", marker_data) is None
 
 
-def test_coco133_skeleton_calculate_fake_marker_pos_unhandled_name():
+def test_coco133_skeleton_calculate_fake_marker_pos_unhandled_name(coco133):
     """
     Test calculate_fake_marker_pos for an unhandled marker name (should fall back to base).
     """
-    skeleton = COCO133Skeleton()
     marker_data = {}
-    assert skeleton.calculate_fake_marker_pos("SomeOtherMarker", marker_data) is None
+    assert coco133.calculate_fake_marker_pos("SomeOtherMarker", marker_data) is None
 
-def test_coco133_body_parts_mapping():
+def test_coco133_body_parts_mapping(coco133):
     """
     Test that COCO133Skeleton correctly maps joints to body parts.
     """
-    skeleton = COCO133Skeleton()
     # Check some known mappings
-    assert skeleton.body_part("Nose") == "Head"
-    assert skeleton.body_part("LShoulder") == "Torso"
-    assert skeleton.body_part("RElbow") == "Right arm"
-    assert skeleton.body_part("RKnee") == "Right leg"
-    assert skeleton.body_part("Hip") == "Torso"
-    assert skeleton.body_part("Neck") == "Torso"
+    assert coco133.body_part("Nose") == "Head"
+    assert coco133.body_part("LShoulder") == "Torso"
+    assert coco133.body_part("RElbow") == "Right arm"
+    assert coco133.body_part("RKnee") == "Right leg"
+    assert coco133.body_part("Hip") == "Torso"
+    assert coco133.body_part("Neck") == "Torso"
     # Check a joint that doesn't exist
-    assert skeleton.body_part("NonExistentJoint") is "Unknown"
\ No newline at end of file
+    assert coco133.body_part("NonExistentJoint") is "Unknown"
+
+
+def test_body_part_mapping_is_per_skeleton(coco133, halpe26):
+    """
+    Test that body part mappings of different skeletons do not leak into each other.
+    """
+    assert coco133.body_part("RElbow") == "Right arm"
+    assert halpe26.body_part("RElbow") == "Unknown"
+    assert halpe26.body_parts() == []
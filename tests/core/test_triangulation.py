@@ -4,10 +4,18 @@
 
 """Unit tests for the triangulation module."""
 
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 
-from pose_editor.core.triangulation import triangulate_point, TriangulationOutput
+from pose_editor.core.triangulation import (
+    TriangulationOutput,
+    projection_matrices,
+    projection_matrix,
+    triangulate_point,
+    triangulate_points_batch,
+)
 
 
 @pytest.fixture
@@ -73,6 +81,56 @@ def test_triangulate_point_not_enough_cameras(mock_calibration_data):
     assert result is None
 
 
+@pytest.mark.parametrize("min_cameras", [0, 1])
+@pytest.mark.parametrize("qualities", [(0.9, 0.2, 0.1), (0.2, 0.2, 0.1)])
+def test_triangulate_point_low_min_cameras_not_enough_cameras(mock_calibration_data, min_cameras, qualities):
+    """Test that fewer than two usable cameras give None even when min_cameras allows fewer."""
+    # Arrange
+    points_2d = {
+        name: np.array([960, 540, quality]) for name, quality in zip(mock_calibration_data, qualities)
+    }
+
+    # Act
+    result = triangulate_point(points_2d, mock_calibration_data, min_cameras=min_cameras, min_quality=0.5)
+
+    # Assert
+    assert result is None
+
+
+@pytest.mark.parametrize("min_cameras", [0, 1])
+def test_triangulate_point_low_min_cameras(mock_calibration_data, min_cameras):
+    """Test that a min_cameras below two never tries to triangulate from a single camera."""
+    # Arrange
+    points_2d = {
+        "cam1": np.array([1200, 600, 0.9]),
+        "cam2": np.array([800, 500, 0.9]),
+        "cam3": np.array([955, 535, 0.9]),
+    }
+
+    # Act
+    result = triangulate_point(points_2d, mock_calibration_data, min_cameras=min_cameras, reproj_error_threshold=0.1)
+
+    # Assert
+    assert result is None
+
+
+def test_triangulate_point_skips_projection_when_not_enough_cameras(mock_calibration_data):
+    """Test that no projection matrices are built when too few cameras pass the quality filter."""
+    # Arrange
+    points_2d = {
+        "cam1": np.array([960, 540, 0.9]),
+        "cam2": np.array([965, 545, 0.2]),
+    }
+
+    # Act
+    with patch("pose_editor.core.triangulation.projection_matrix", wraps=projection_matrix) as mock_projection:
+        result = triangulate_point(points_2d, mock_calibration_data, min_quality=0.5)
+
+    # Assert
+    assert result is None
+    mock_projection.assert_not_called()
+
+
 def test_triangulate_point_high_reprojection_error(mock_calibration_data):
     """Test that triangulation returns None if the error is too high."""
     # Arrange
@@ -88,4 +146,71 @@ def test_triangulate_point_high_reprojection_error(mock_calibration_data):
     result = triangulate_point(points_2d, mock_calibration_data, reproj_error_threshold=0.1)
 
     # Assert
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_triangulate_point_recovers_projected_point(mock_calibration_data):
+    """Test that exact projections of a known point triangulate back to that point."""
+    # Arrange
+    point_3d = np.array([0.2, -0.1, 5.0, 1.0])
+    points_2d = {}
+    for name, calib in mock_calibration_data.items():
+        projected = projection_matrix(calib) @ point_3d
+        points_2d[name] = np.array([projected[0] / projected[2], projected[1] / projected[2], 0.9])
+
+    # Act
+    result = triangulate_point(points_2d, mock_calibration_data)
+
+    # Assert
+    assert result is not None
+    assert np.allclose(result.point_3d, point_3d[:3], atol=1e-6)
+    assert result.contributing_cameras == ("cam1", "cam2", "cam3")
+    assert result.reprojection_error < 1e-6
+
+
+def test_triangulate_point_uses_given_projection_matrices(mock_calibration_data):
+    """Test that precomputed projection matrices are used instead of being rebuilt from the calibration."""
+    # Arrange
+    point_3d = np.array([0.2, -0.1, 5.0, 1.0])
+    points_2d = {}
+    for name, calib in mock_calibration_data.items():
+        projected = projection_matrix(calib) @ point_3d
+        points_2d[name] = np.array([projected[0] / projected[2], projected[1] / projected[2], 0.9])
+    proj_matrices = projection_matrices(mock_calibration_data)
+
+    # Act
+    with patch("pose_editor.core.triangulation.projection_matrix", wraps=projection_matrix) as mock_projection:
+        result = triangulate_point(points_2d, mock_calibration_data, projection_matrices_by_camera=proj_matrices)
+
+    # Assert
+    mock_projection.assert_not_called()
+    assert result is not None
+    assert np.allclose(result.point_3d, point_3d[:3], atol=1e-6)
+
+
+def test_triangulate_points_batch(mock_calibration_data):
+    """Test batched triangulation of several frames, including one with too few usable cameras."""
+    # Arrange
+    camera_names = ["cam1", "cam2", "cam3"]
+    points_3d = np.array([[0.2, -0.1, 5.0], [0.0, 0.3, 4.0], [-0.4, 0.1, 6.0]])
+    points_2d_batch = np.zeros((3, 3, 3))
+    for frame, point in enumerate(points_3d):
+        for cam_idx, name in enumerate(camera_names):
+            projected = projection_matrix(mock_calibration_data[name]) @ np.append(point, 1.0)
+            points_2d_batch[frame, cam_idx] = [projected[0] / projected[2], projected[1] / projected[2], 0.9]
+    points_2d_batch[2, 1:, 2] = 0.1  # Only one good camera in the last frame
+
+    # Act
+    result_points, result_errors, cameras_used = triangulate_points_batch(
+        points_2d_batch,
+        mock_calibration_data,
+        camera_names,
+        projection_matrices_by_camera=projection_matrices(mock_calibration_data),
+    )
+
+    # Assert
+    assert result_points.shape == (3, 3)
+    assert np.allclose(result_points[:2], points_3d[:2], atol=1e-6)
+    assert np.all(result_errors[:2] < 1e-6)
+    assert np.isnan(result_points[2]).all()
+    assert np.isnan(result_errors[2])
+    assert cameras_used.tolist() == [[True, True, True], [True, True, True], [False, False, False]]
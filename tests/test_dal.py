@@ -8,50 +8,142 @@ import pytest
 
 from pose_editor.blender import dal
 
+pytestmark = pytest.mark.blender
+
+
+@pytest.fixture(scope="module", autouse=True)
+def clean_blender_scene(clear_scene):
+    """Cleans the Blender scene once before and after the tests of this module."""
+    clear_scene()
+    yield
+    clear_scene()
+
 
 @pytest.fixture(autouse=True)
-def clean_blender_scene():
-    """Cleans the Blender scene before each test."""
-    bpy.context.preferences.filepaths.use_scripts_auto_execute = True
-    # Clean up actions
-    for action in bpy.data.actions:
-        bpy.data.actions.remove(action)
-    # Clean up objects
-    if bpy.data.objects:
-        bpy.ops.object.select_all(action="SELECT")
-        bpy.ops.object.delete()
-    # Clean up collections
-    for collection in bpy.data.collections:
-        # Don't remove the scene collection
-        if collection.name not in (bpy.context.scene.collection.name, "Scene Collection"):
-            bpy.data.collections.remove(collection)
+def remove_test_data(clean_blender_scene):
+    """Removes the actions, objects and collections created by a test, leaving the rest of the scene alone."""
+    actions_before = set(bpy.data.actions.keys())
+    objects_before = set(bpy.data.objects.keys())
+    collections_before = set(bpy.data.collections.keys())
     yield
-    # Final cleanup after test
-    for action in bpy.data.actions:
-        bpy.data.actions.remove(action)
-    if bpy.data.objects:
-        bpy.ops.object.select_all(action="SELECT")
-        bpy.ops.object.delete()
-    for collection in bpy.data.collections:
-        if collection.name not in (bpy.context.scene.collection.name, "Scene Collection"):
-            bpy.data.collections.remove(collection)
+    bpy.data.batch_remove(
+        ids=(
+            *(action for action in bpy.data.actions if action.name not in actions_before),
+            *(obj for obj in bpy.data.objects if obj.name not in objects_before),
+            *(col for col in bpy.data.collections if col.name not in collections_before),
+        )
+    )
+
+
+@pytest.fixture(scope="class")
+def blender_parent_obj(clean_blender_scene):
+    """A real Blender parent object shared by the tests of a class.
+
+    Like created_marker, it is created before remove_test_data takes its snapshot and so
+    survives the cleanup between tests. Tests that modify the parent use fresh_parent_obj.
+    """
+    parent = bpy.data.objects.new("ParentObj", None)
+    bpy.context.scene.collection.objects.link(parent)
+    yield parent
+    bpy.data.objects.remove(parent, do_unlink=True)
 
 
 @pytest.fixture
-def blender_parent_obj():
-    """Fixture for a real Blender parent object."""
-    bpy.ops.object.empty_add(type="PLAIN_AXES", align="WORLD", location=(0, 0, 0))
-    parent = bpy.context.active_object
-    parent.name = "ParentObj"
+def fresh_parent_obj():
+    """A real Blender parent object for a single test, removed by remove_test_data."""
+    parent = bpy.data.objects.new("FreshParentObj", None)
+    bpy.context.scene.collection.objects.link(parent)
     return parent
 
 
-@pytest.fixture
+@pytest.fixture(scope="class")
 def blender_obj_ref(blender_parent_obj):
-    """Fixture for a real BlenderObjRef."""
+    """Fixture for a real BlenderObjRef to the shared parent object."""
     return dal.BlenderObjRef(blender_parent_obj.name)
 
 
+def _get_co(fcurve):
+    """Reads all keyframe coordinates of an F-Curve in one call, as an (n, 2) array of (frame, value)."""
+    co = np.empty(2 * len(fcurve.keyframe_points), dtype=np.float32)
+    fcurve.keyframe_points.foreach_get("co", co)
+    return co.reshape(-1, 2)
+
+
+MARKER_NAME = "TestMarker"
+MARKER_COLOR = (1.0, 0.0, 0.0, 1.0)  # Red
+_EXPECTED_COLOR_DRIVER_EXPRS = tuple(
+    f"get_quality_driven_color_component(quality, r, g, b, a, {i})" for i in range(4)
+)
+_EXPECTED_COLOR_DRIVER_VARS = {
+    "quality": '["quality"]',
+    "r": '["_original_color_r"]',
+    "g": '["_original_color_g"]',
+    "b": '["_original_color_b"]',
+    "a": '["_original_color_a"]',
+}
+
+
+@pytest.fixture(scope="module")
+def created_marker(clean_blender_scene, tiny_png):
+    """A marker created once for the read-only marker tests, with its parent object.
+
+    Being module-scoped, it is created before remove_test_data takes its snapshot and so
+    survives the cleanup between tests. Tests must not modify it.
+    """
+    parent_obj = bpy.data.objects.new("MarkerParentObj", None)
+    bpy.context.scene.collection.objects.link(parent_obj)
+
+    marker_ref = dal.create_marker(
+        dal.BlenderObjRef(parent_obj.name), MARKER_NAME, MARKER_COLOR, image_path=str(tiny_png)
+    )
+    yield marker_ref, parent_obj
+    bpy.data.objects.remove(marker_ref._get_obj(), do_unlink=True)
+    bpy.data.objects.remove(parent_obj, do_unlink=True)
+
+
+class TestDalBlenderReadOnly:
+    """Checks that only read the shared created_marker and create no Blender data of their own."""
+
+    @pytest.fixture(scope="class", autouse=True)
+    def remove_test_data(self):
+        """Overrides the module's per-test cleanup: these tests leave nothing behind."""
+
+    def test_create_marker_parent(self, created_marker):
+        marker_ref, parent_obj = created_marker
+        marker_obj = marker_ref._get_obj()
+        assert marker_obj is not None
+        assert marker_obj.parent == parent_obj
+
+    def test_create_marker_name(self, created_marker):
+        marker_ref, parent_obj = created_marker
+        assert marker_ref._get_obj().name == f"{parent_obj.name}_{MARKER_NAME}"
+
+    def test_create_marker_image(self, created_marker):
+        marker_obj = created_marker[0]._get_obj()
+        assert marker_obj.type == "EMPTY"
+        assert marker_obj.empty_display_type == "IMAGE"
+        assert marker_obj.data is not None
+        assert marker_obj.data.name == "test_marker.png"
+
+    def test_create_marker_role(self, created_marker):
+        # Assert that the MARKER_ROLE custom property is set
+        assert dal.get_custom_property(created_marker[0], dal.MARKER_ROLE) == MARKER_NAME
+
+    def test_create_marker_quality_props(self, created_marker):
+        marker_obj = created_marker[0]._get_obj()
+        assert marker_obj["quality"] == pytest.approx(1.0)
+        original_color = tuple(marker_obj[f"_original_color_{c}"] for c in "rgba")
+        assert original_color == pytest.approx(MARKER_COLOR)
+
+    def test_create_marker_color_drivers(self, created_marker):
+        marker_obj = created_marker[0]._get_obj()
+        drivers_by_key = {(fc.data_path, fc.array_index): fc.driver for fc in marker_obj.animation_data.drivers}
+        for i, expression in enumerate(_EXPECTED_COLOR_DRIVER_EXPRS):
+            driver = drivers_by_key[("color", i)]
+            assert driver.expression == expression
+            assert {var.name: var.targets[0].data_path for var in driver.variables} == _EXPECTED_COLOR_DRIVER_VARS
+
+
 class TestDalBlender:
     def test_create_collection(self):
         collection_name = "TestCollection"
@@ -69,39 +161,42 @@ class TestDalBlender:
         assert empty_name in bpy.data.objects
         assert empty_name in bpy.context.scene.collection.objects
 
-    def test_create_marker_success(self, blender_obj_ref, blender_parent_obj, tmp_path):
-        # Create a dummy image file for the test
-        assets_dir = tmp_path / "assets"
-        assets_dir.mkdir()
-        test_image_path = assets_dir / "test_marker.png"
-
-        # Create a minimal 1x1 black PNG
-        png_data = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
-        test_image_path.write_bytes(png_data)
-
-        marker_name = "TestMarker"
-        marker_color = (1.0, 0.0, 0.0, 1.0)  # Red
+    def test_create_marker_reuses_loaded_image(self, created_marker, fresh_parent_obj, tiny_png):
+        images_before = len(bpy.data.images)
 
-        result_ref = dal.create_marker(blender_obj_ref, marker_name, marker_color, image_path=str(test_image_path))
-
-        marker_obj = result_ref._get_obj()
-        assert marker_obj is not None
-        assert marker_obj.parent == blender_parent_obj
-        assert marker_obj.name == f"{blender_parent_obj.name}_{marker_name}"
-        assert marker_obj.type == "EMPTY"
-        assert marker_obj.empty_display_type == "IMAGE"
-        assert marker_obj.data is not None
-        assert marker_obj.data.name == "test_marker.png"
-        # Assert that the MARKER_ROLE custom property is set
-        assert dal.get_custom_property(result_ref, dal.MARKER_ROLE) == marker_name
+        marker_ref = dal.create_marker(
+            dal.BlenderObjRef(fresh_parent_obj.name), MARKER_NAME, MARKER_COLOR, image_path=str(tiny_png)
+        )
 
-    def test_set_and_get_custom_property_string(self, blender_obj_ref):
-        prop = dal.CustomProperty[str]("my_string_prop")
-        value = "hello world"
+        # The image was already loaded for created_marker, so the datablock is shared, not decoded again
+        assert marker_ref._get_obj().data == created_marker[0]._get_obj().data
+        assert len(bpy.data.images) == images_before
+
+    @pytest.mark.parametrize(
+        "prop_type, prop_name, value",
+        [
+            (int, "my_int_prop", 123),
+            (str, "my_string_prop", "hello world"),
+            # Python bools are stored as boolean ID properties and read back as bool, not int
+            (bool, "my_bool_prop", True),
+        ],
+        ids=["int", "string", "bool"],
+    )
+    def test_set_and_get_custom_property(self, blender_obj_ref, prop_type, prop_name, value):
+        prop = dal.CustomProperty[prop_type](prop_name)
         dal.set_custom_property(blender_obj_ref, prop, value)
         retrieved_value = dal.get_custom_property(blender_obj_ref, prop)
         assert retrieved_value == value
-        assert isinstance(retrieved_value, str)
+        # Exact type: isinstance would let a bool pass for an int
+        assert type(retrieved_value) is prop_type
+
+    def test_set_and_get_custom_property_float(self, blender_obj_ref):
+        prop = dal.CustomProperty[float]("my_float_prop")
+        dal.set_custom_property(blender_obj_ref, prop, 123.45)
+        retrieved_value = dal.get_custom_property(blender_obj_ref, prop)
+        # Stored as a double, but compared approximately like every other float in these tests
+        assert retrieved_value == pytest.approx(123.45)
+        assert type(retrieved_value) is float
 
     # --- New/Refactored Tests for Slotted Actions ---
 
@@ -168,18 +263,34 @@ class TestDalBlender:
         dal.set_fcurve_keyframes(fcurve, keyframes)
 
         assert len(fcurve.keyframe_points) == len(keyframes)
-        for i, (frame, value) in enumerate(keyframes):
-            kp = fcurve.keyframe_points[i]
-            assert kp.co.x == pytest.approx(frame)
-            assert kp.co.y == pytest.approx(value)
-            assert kp.interpolation == "LINEAR"
-
-    def test_assign_action_to_object(self, blender_obj_ref):
-        obj = blender_obj_ref._get_obj()
+        assert np.allclose(_get_co(fcurve), np.asarray(keyframes, dtype=np.float32))
+        assert all(kp.interpolation == "LINEAR" for kp in fcurve.keyframe_points)
+
+    def test_set_fcurve_keyframes_unsorted(self):
+        action = dal.get_or_create_action("UnsortedKeyframeAction")
+        fcurve = dal.get_or_create_fcurve(action, "TestSlot", "location", index=1)
+
+        dal.set_fcurve_keyframes(fcurve, [(20.0, 5.0), (1.0, 10.0), (10.0, 20.0)])
+
+        # The points are written in bulk, so they must still come out sorted by frame
+        assert np.allclose(_get_co(fcurve), [(1.0, 10.0), (10.0, 20.0), (20.0, 5.0)])
+
+    def test_set_fcurve_keyframes_duplicate_frame(self):
+        action = dal.get_or_create_action("DuplicateKeyframeAction")
+        fcurve = dal.get_or_create_fcurve(action, "TestSlot", "location", index=2)
+
+        dal.set_fcurve_keyframes(fcurve, [(1.0, 10.0), (5.0, 20.0), (1.0, 30.0)])
+
+        # A repeated frame replaces the earlier key instead of stacking a second one on it
+        assert np.allclose(_get_co(fcurve), [(1.0, 30.0), (5.0, 20.0)])
+
+    def test_assign_action_to_object(self, fresh_parent_obj):
+        obj_ref = dal.BlenderObjRef(fresh_parent_obj.name)
+        obj = fresh_parent_obj
         action = dal.get_or_create_action("AssignAction")
         slot_name = "MyObjectSlot"
 
-        dal.assign_action_to_object(blender_obj_ref, action, slot_name)
+        dal.assign_action_to_object(obj_ref, action, slot_name)
 
         assert obj.animation_data is not None
         assert obj.animation_data.action == action
@@ -201,25 +312,45 @@ class TestDalBlender:
         # Test for non-existent fcurve
         assert dal.get_fcurve_from_action(action, slot_name, "location", index=0) is None
 
-    def test_get_or_create_object_with_parent(self, blender_parent_obj):
+    def test_get_or_create_object_with_parent(self, fresh_parent_obj):
         """Tests creating an object with a specified parent."""
         child_name = "ChildObject"
-        parent_ref = dal.BlenderObjRef(blender_parent_obj.name)
+        parent_ref = dal.BlenderObjRef(fresh_parent_obj.name)
 
         child_ref = dal.get_or_create_object(child_name, "EMPTY", parent=parent_ref)
         child_obj = child_ref._get_obj()
 
         assert child_obj is not None
-        assert child_obj.parent == blender_parent_obj
-
-    def test_sample_fcurve(self):
+        assert child_obj.parent == fresh_parent_obj
+
+    def test_get_children_of_object(self, fresh_parent_obj):
+        def add_child(name, parent):
+            child = bpy.data.objects.new(name, None)
+            bpy.context.scene.collection.objects.link(child)
+            child.parent = parent
+            return child
+
+        # Parent -> Child0, Child1; Child0 -> Grandchild0, Grandchild1; Grandchild1 -> GreatGrandchild
+        children = [add_child("Child0", fresh_parent_obj), add_child("Child1", fresh_parent_obj)]
+        grandchildren = [add_child("Grandchild0", children[0]), add_child("Grandchild1", children[0])]
+        great_grandchild = add_child("GreatGrandchild", grandchildren[1])
+        parent_ref = dal.BlenderObjRef(fresh_parent_obj.name)
+
+        direct = dal.get_children_of_object(parent_ref)
+        assert sorted(ref._id for ref in direct) == sorted(child.name for child in children)
+
+        descendants = dal.get_children_of_object(parent_ref, recursive=True)
+        all_names = [obj.name for obj in (*children, *grandchildren, great_grandchild)]
+        assert sorted(ref._id for ref in descendants) == sorted(all_names)
+
+    @pytest.mark.parametrize("start_frame, end_frame", [(0, 10), (0.0, 10.0)])
+    def test_sample_fcurve(self, start_frame, end_frame):
         action = dal.get_or_create_action("SampleAction")
         fcurve = dal.get_or_create_fcurve(action, "TestSlot", "location", index=0)
 
         keyframes = [(0, 0), (10, 10)]
         dal.set_fcurve_keyframes(fcurve, keyframes)
 
-        start_frame, end_frame = 0, 10
         sampled_data = dal.sample_fcurve(fcurve, start_frame, end_frame)
 
         assert isinstance(sampled_data, np.ndarray)
@@ -254,32 +385,18 @@ class TestDalBlender:
 
         # --- Verification ---
 
-        # 1. Verify Slot1, location.x
+        # Each F-Curve gets the (frame, value) pairs of its column, with the nan frames skipped
+        expected_by_column = {
+            ("Slot1", "location", 0): [(10, 1.0), (11, 1.1), (13, 1.3), (14, 1.4)],  # Frame 12 was nan
+            ("Slot1", "location", 1): [(10, 2.0), (11, 2.2), (12, 2.4), (14, 2.8)],  # Frame 13 was nan
+            ("Slot1", "location", 2): [(10, 0.0), (11, 0.0), (12, 0.0), (14, 0.0)],  # Frame 13 was nan
+            ("Slot2", '["quality"]', -1): [(10, 0.9), (11, 0.8), (12, 0.7), (14, 0.5)],  # Frame 13 was nan
+        }
+        for (slot_name, data_path, index), expected in expected_by_column.items():
+            fcurve = dal.get_fcurve_from_action(action, slot_name, data_path, index)
+            assert fcurve is not None
+            np.testing.assert_allclose(_get_co(fcurve), expected, rtol=1e-6)
+
+        # Check interpolation mode on one keyframe
         fcurve_x = dal.get_fcurve_from_action(action, "Slot1", "location", 0)
-        assert fcurve_x is not None
-        assert len(fcurve_x.keyframe_points) == 4  # One frame was nan
-        assert fcurve_x.keyframe_points[0].co.y == pytest.approx(1.0)
-
-        # 2. Verify Slot1, location.y
-        fcurve_y = dal.get_fcurve_from_action(action, "Slot1", "location", 1)
-        assert fcurve_y is not None
-        assert len(fcurve_y.keyframe_points) == 4  # One frame was nan
-        assert fcurve_y.keyframe_points[0].co.y == pytest.approx(2.0)
-
-        # 3. Verify Slot1, location.z
-        fcurve_z = dal.get_fcurve_from_action(action, "Slot1", "location", 2)
-        assert fcurve_z is not None
-        assert len(fcurve_z.keyframe_points) == 4  # One frame was nan
-        assert fcurve_z.keyframe_points[0].co.y == pytest.approx(0.0)
-        # All z values should be 0
-        for kp in fcurve_z.keyframe_points:
-            assert kp.co.y == pytest.approx(0.0)
-
-        # 4. Verify Slot2, quality
-        fcurve_q = dal.get_fcurve_from_action(action, "Slot2", '["quality"]', -1)
-        assert fcurve_q is not None
-        assert len(fcurve_q.keyframe_points) == 4  # One frame was nan
-        assert fcurve_q.keyframe_points[0].co.y == pytest.approx(0.9)
-
-        # 5. Check interpolation mode on one keyframe
         assert fcurve_x.keyframe_points[0].interpolation == "LINEAR"
@@ -2,10 +2,11 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import bpy
 import pytest
 
-from pose_editor import register, unregister  # Import register/unregister functions
+from pose_editor import PE_OT_dummy, register, unregister
+
+pytestmark = [pytest.mark.blender, pytest.mark.usefixtures("blender_session")]
 
 
 def test_install_addon():
@@ -15,12 +16,12 @@ def test_install_addon():
     # Register the extension
     register()
 
-    # Check that the dummy operator is registered
-    assert hasattr(bpy.ops.pose_editor, "dummy")
+    # Check that the dummy operator is registered; is_registered is read off the class
+    # without resolving the operator through bpy.ops
+    assert PE_OT_dummy.is_registered
 
     # Unregister the extension
     unregister()
 
     # Check that the dummy operator is unregistered
-    with pytest.raises(AttributeError):
-        bpy.ops.pose_editor.dummy()
+    assert not PE_OT_dummy.is_registered
@@ -2,40 +2,15 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
 import bpy
 import pytest
 
-from pose_editor import register, unregister  # Import register/unregister
+from pose_editor.blender import dal, operators
 from pose_editor.core.person_facade import IS_REAL_PERSON_INSTANCE
 
-
-@pytest.fixture
-def clean_blender_scene():
-    """Fixture to ensure a clean Blender scene for each test."""
-    # Clear all objects
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete()
-    # Clear all collections except the master collection
-    for collection in bpy.data.collections:
-        if collection.name != "Collection":  # Default master collection
-            bpy.data.collections.remove(collection)
-    yield
-    # Clean up after test (optional, as fixture runs before each test)
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete()
-    for collection in bpy.data.collections:
-        if collection.name != "Collection":
-            bpy.data.collections.remove(collection)
-
-
-@pytest.fixture(autouse=True)
-def register_addon():
-    """Fixture to register and unregister the add-on for tests."""
-    register()
-    yield
-    unregister()
+pytestmark = [pytest.mark.blender, pytest.mark.usefixtures("registered_addon")]
 
 
 def test_create_project_operator(clean_blender_scene):
@@ -45,9 +20,10 @@ def test_create_project_operator(clean_blender_scene):
     # Run the operator
     bpy.ops.pose_editor.create_project()
 
-    # Assert collections are created
-    assert "Camera Views" in bpy.data.collections
-    assert "Real Persons" in bpy.data.collections
+    # Assert collections are created; names are read once into a set for the membership checks
+    collection_names = frozenset(bpy.data.collections.keys())
+    assert "Camera Views" in collection_names
+    assert "Real Persons" in collection_names
 
     # Assert _ProjectSettings empty is created
     assert "_ProjectSettings" in bpy.data.objects
@@ -55,9 +31,7 @@ def test_create_project_operator(clean_blender_scene):
     assert project_settings_empty.type == "EMPTY"
 
     # Assert collections are linked to master collection
-    master_collection_children_names = [
-        c.name for c in bpy.context.scene.collection.children
-    ]
+    master_collection_children_names = frozenset(bpy.context.scene.collection.children.keys())
     assert "Camera Views" in master_collection_children_names
     assert "Real Persons" in master_collection_children_names
 
@@ -65,67 +39,56 @@ def test_create_project_operator(clean_blender_scene):
     assert project_settings_empty.users_collection[0] == bpy.context.scene.collection
 
 
-class MockLocation:
-    def __init__(self):
-        self.x = 0
-        self.y = 0
-        self.z = 0
-
-
-@patch("pose_editor.blender.operators.PE_OT_AddPersonInstance._update_ui_state")
-@patch("pose_editor.blender.operators.CameraView")
-@patch("pose_editor.blender.operators.PersonDataView")
-@patch("pose_editor.blender.operators.MarkerData")
-@patch("pose_editor.blender.operators.RealPersonInstanceFacade")
-def test_add_person_instance_operator(
-    mock_person_facade,
-    mock_marker_data,
-    mock_person_data_view,
-    mock_camera_view,
-    mock_update_ui,
-    clean_blender_scene,
-):
+def test_add_person_instance_operator(monkeypatch, clean_blender_scene):
     """
     Tests that the PE_OT_AddPersonInstance operator creates a Real Person instance
     and its associated views, applying the correct offset.
     """
     # Arrange
-    # 1. Mock RealPersonInstanceFacade.get_all() to return empty list (no existing persons)
-    mock_person_facade.get_all.return_value = []
-
-    # 2. Mock RealPersonInstanceFacade.create_new() to return a mock facade with .obj
-    mock_person_obj_ref = MagicMock()
-    mock_person_obj_ref.name = "Alice"
-    mock_facade_instance = MagicMock()
-    mock_facade_instance.obj = mock_person_obj_ref
-    mock_facade_instance.name = "Alice"
-    mock_person_facade.create_new.return_value = mock_facade_instance
-
-    # 3. Mock CameraView.get_all() to return a mock CameraView instance
-    mock_cam_view = MagicMock()
-    mock_cam_view._obj.name = "View_cam1"
-    mock_camera_view.get_all.return_value = [mock_cam_view]
-
-    # 4. Mock PersonDataView.create_new to return a mock with a settable location
-    mock_pv = MagicMock()
-    mock_loc = MockLocation()
-    mock_obj = MagicMock()
-    mock_obj.location = mock_loc
-    mock_pv.view_root_object._get_obj.return_value = mock_obj
-    mock_person_data_view.create_new.return_value = mock_pv
+    # The collaborators are replaced with plain SimpleNamespace fakes that record their calls
+    calls = []
+
+    def get_all_persons():
+        calls.append("RealPersonInstanceFacade.get_all")
+        return []  # No existing persons
+
+    def create_person(name):
+        calls.append(("RealPersonInstanceFacade.create_new", name))
+        return SimpleNamespace(name=name, obj=SimpleNamespace(name=name))
+
+    def create_person_data_view(**kwargs):
+        calls.append("PersonDataView.create_new")
+        return SimpleNamespace(connect_to_series=lambda series: None)
+
+    # A single camera view named "cam1"; the operator only reads its SERIES_NAME
+    cam_view = SimpleNamespace(_obj=SimpleNamespace())
+
+    def get_custom_property(obj_ref, prop):
+        assert obj_ref is cam_view._obj and prop is dal.SERIES_NAME
+        return "cam1"
+
+    monkeypatch.setattr(
+        operators,
+        "RealPersonInstanceFacade",
+        SimpleNamespace(get_all=get_all_persons, create_new=create_person),
+    )
+    monkeypatch.setattr(operators, "CameraView", SimpleNamespace(get_all=lambda: [cam_view]))
+    monkeypatch.setattr(dal, "get_custom_property", get_custom_property)
+    monkeypatch.setattr(operators, "MarkerData", SimpleNamespace(create_new=lambda *args: SimpleNamespace()))
+    monkeypatch.setattr(operators, "PersonDataView", SimpleNamespace(create_new=create_person_data_view))
+    monkeypatch.setattr(
+        operators.PE_OT_AddPersonInstance,
+        "_update_ui_state",
+        lambda self, context: calls.append("_update_ui_state"),
+    )
 
     # Act
     bpy.ops.pose_editor.add_person_instance(person_name="Alice")
 
     # Assert
-    # Check that the UI state update was called
-    mock_update_ui.assert_called_once()
-
-    # Check that RealPersonInstanceFacade.get_all was called to check for existing person
-    mock_person_facade.get_all.assert_called_once()
-
-    # Check that RealPersonInstanceFacade.create_new was called to create the person
-    mock_person_facade.create_new.assert_called_once_with("Alice")
-
-    # Check that PersonDataView was created for the camera view
-    mock_person_data_view.create_new.assert_called_once()
\ No newline at end of file
+    # Check that the operator looked for an existing person once, created the person,
+    # updated the UI state once and created one PersonDataView for the camera view
+    assert calls.count("RealPersonInstanceFacade.get_all") == 1
+    assert calls.count(("RealPersonInstanceFacade.create_new", "Alice")) == 1
+    assert calls.count("_update_ui_state") == 1
+    assert calls.count("PersonDataView.create_new") == 1
@@ -5,35 +5,9 @@
 import bpy
 import pytest
 
-from pose_editor import register, unregister  # Import register/unregister
 from pose_editor.blender import scene_builder
 
-
-@pytest.fixture
-def clean_blender_scene():
-    """Fixture to ensure a clean Blender scene for each test."""
-    # Clear all objects
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete()
-    # Clear all collections except the master collection
-    for collection in bpy.data.collections:
-        if collection.name != "Collection":  # Default master collection
-            bpy.data.collections.remove(collection)
-    yield
-    # Clean up after test (optional, as fixture runs before each test)
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete()
-    for collection in bpy.data.collections:
-        if collection.name != "Collection":
-            bpy.data.collections.remove(collection)
-
-
-@pytest.fixture(autouse=True)
-def register_addon():
-    """Fixture to register and unregister the add-on for tests."""
-    register()
-    yield
-    unregister()
+pytestmark = [pytest.mark.blender, pytest.mark.usefixtures("registered_addon")]
 
 
 def test_create_project_structure(clean_blender_scene):
@@ -42,9 +16,10 @@ def test_create_project_structure(clean_blender_scene):
     """
     scene_builder.create_project_structure()
 
-    # Assert collections are created
-    assert "Camera Views" in bpy.data.collections
-    assert "Real Persons" in bpy.data.collections
+    # Assert collections are created; names are read once into a set for the membership checks
+    collection_names = frozenset(bpy.data.collections.keys())
+    assert "Camera Views" in collection_names
+    assert "Real Persons" in collection_names
 
     # Assert _ProjectSettings empty is created
     assert "_ProjectSettings" in bpy.data.objects
@@ -52,7 +27,7 @@ def test_create_project_structure(clean_blender_scene):
     assert project_settings_empty.type == "EMPTY"
 
     # Assert collections are linked to master collection
-    master_collection_children_names = [c.name for c in bpy.context.scene.collection.children]
+    master_collection_children_names = frozenset(bpy.context.scene.collection.children.keys())
     assert "Camera Views" in master_collection_children_names
     assert "Real Persons" in master_collection_children_names
 